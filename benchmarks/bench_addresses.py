@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Throughput of address normalization and PIN cross-checks on a large frame.
+
+    PYTHONPATH=src python benchmarks/bench_addresses.py --records 1000000 --unique 50000
+
+Rows repeat a pool of address variants the way an all-India run repeats the
+same mandis across passes and re-scrapes. Times `add_address_columns` (one
+normalization per unique address) and a per-record pass like the in-flight
+dedup keys, with and without the `normalize_address` LRU cache.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from enam_scraper import addresses
+from enam_scraper.addresses import add_address_columns, cache_info
+
+TOWNS = [('Gujarat', 'Rajkot', '360'), ('Maharashtra', 'Pune', '411'), ('Karnataka', 'Bengaluru', '560'),
+         ('Rajasthan', 'Kota', '324'), ('Haryana', 'Karnal', '132'), ('Uttar Pradesh', 'Agra', '282')]
+PREFIXES = ['A.P.M.C. Market-Yard', 'Krushi Utpanna Bazar Samiti, Marketyard', 'APMC Market Yard',
+            'Agricultural Produce Market Committee', 'Krishi Upaj Mandi Samiti, Mkt. Yard']
+
+
+def make_frame(count, unique, seed=0):
+    rng = np.random.default_rng(seed)
+    pool = []
+    for i in range(unique):
+        state, district, prefix = TOWNS[i % len(TOWNS)]
+        pin = f"{prefix}{rng.integers(1, 999):03d}"
+        pin = pin if i % 3 else f"{pin[:3]} {pin[3:]}"
+        pool.append((state, district, f"{PREFIXES[i % len(PREFIXES)]}, Nr. Bus Stand {i}, "
+                                      f"Dist. {district}, PIN {pin}"))
+    rows = [pool[i] for i in rng.integers(unique, size=count)]
+    df = pd.DataFrame(rows, columns=['state', 'district', 'address'])
+    df['pin_code'] = ''
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--unique", type=int, default=50_000)
+    args = parser.parse_args()
+
+    df = make_frame(args.records, args.unique)
+    print(f"{len(df):,} rows, {df['address'].nunique():,} unique addresses")
+
+    started = time.perf_counter()
+    out = add_address_columns(df.copy())
+    print(f"{'add_address_columns':>28}: {time.perf_counter() - started:>6.2f}s")
+    print(out['pin_check'].value_counts().to_string())
+
+    # Per-record callers (DedupIndex keys, sink keys, shingles) normalize every row
+    texts = df['address'].tolist()
+    sample = texts[:min(len(texts), 100_000)]
+    started = time.perf_counter()
+    for text in sample:
+        addresses._canonical(text)
+    per_row = (time.perf_counter() - started) / len(sample)
+    print(f"{'per record, uncached':>28}: {per_row * len(texts):>6.2f}s  (extrapolated from {len(sample):,} rows)")
+    started = time.perf_counter()
+    for text in texts:
+        addresses.normalize_address(text)
+    print(f"{'per record, LRU cached':>28}: {time.perf_counter() - started:>6.2f}s")
+    info = cache_info()
+    print(f"{'normalize_address cache':>28}: {info.hits / (info.hits + info.misses):.1%} hits "
+          f"({info.currsize:,} cached)")
+
+
+if __name__ == "__main__":
+    main()
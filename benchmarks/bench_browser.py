@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Compare the default and lean Chrome setups against the local stand-in portal.
+
+    PYTHONPATH=src python benchmarks/bench_browser.py --loads 5 --assets 20 --latency 0.2
+
+For each mode this starts one driver, loads the contact page and selects a
+state `--loads` times, and reports driver start-up time (what reusing a warmed
+driver saves per state), mean page load time, static requests served and the
+RSS of the driver's process tree (chromedriver + Chrome, needs psutil).
+"""
+import argparse
+import json
+import os
+import time
+
+from enam_scraper.metrics import Metrics
+from enam_scraper.portal_server import serve_in_background, synthetic_portal
+from enam_scraper.scraper import FocusedEnamScraper
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def driver_rss_mb(scraper):
+    """Resident memory of chromedriver and every Chrome process it started"""
+    if psutil is None:
+        return None
+    try:
+        root = psutil.Process(scraper.driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return None
+    total = 0
+    for proc in processes:
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            pass
+    return round(total / 2 ** 20, 1)
+
+
+def run_mode(lean, server, state, loads):
+    hits = server.RequestHandlerClass.hits
+    static_before = sum(count for path, count in hits.items() if path.startswith('/static/'))
+    metrics = Metrics()
+
+    started = time.perf_counter()
+    scraper = FocusedEnamScraper(base_url=server.url, metrics=metrics, lean=lean)
+    start_up = time.perf_counter() - started
+    try:
+        for _ in range(loads):
+            scraper.open_state(state)
+        rss = driver_rss_mb(scraper)
+        profile_dir = scraper.profile_dir
+    finally:
+        scraper.close()
+
+    count, total = metrics.totals('page_load')
+    return {
+        'mode': 'lean' if lean else 'default',
+        'driver_start_sec': round(start_up, 2),
+        'page_load_mean_sec': round(total / count, 3) if count else None,
+        'static_requests': sum(count for path, count in hits.items()
+                               if path.startswith('/static/')) - static_before,
+        'driver_rss_mb': rss,
+        'profile_cleaned': not os.path.exists(profile_dir),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--loads", type=int, default=5, help="Page loads per mode")
+    parser.add_argument("--assets", type=int, default=20, help="Images on the stand-in page")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stand-in response delay (s)")
+    parser.add_argument("--report", default=None, help="JSON report path (default: bench_browser_<epoch>.json)")
+    args = parser.parse_args()
+
+    portal = synthetic_portal(states=1)
+    server = serve_in_background(portal, port=0, latency=args.latency, assets=args.assets)
+    try:
+        results = [run_mode(lean, server, next(iter(portal)), args.loads) for lean in (False, True)]
+    finally:
+        server.shutdown()
+
+    default, lean = results
+    report = {'loads': args.loads, 'assets': args.assets, 'latency': args.latency, 'modes': results}
+    if default['page_load_mean_sec'] and lean['page_load_mean_sec']:
+        report['page_load_speedup'] = round(default['page_load_mean_sec'] / lean['page_load_mean_sec'], 2)
+    if default['driver_rss_mb'] and lean['driver_rss_mb']:
+        report['rss_saved_mb'] = round(default['driver_rss_mb'] - lean['driver_rss_mb'], 1)
+
+    report_path = os.path.abspath(args.report or f"bench_browser_{int(time.time())}.json")
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    print(f"✓ Report written to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Benchmark clean_data against the original multi-pass implementation.
+
+    PYTHONPATH=src python benchmarks/bench_clean.py --rows 1000000
+"""
+import argparse
+import os
+import platform
+import time
+
+import numpy as np
+import pandas as pd
+
+from enam_scraper.cleaning import clean_data
+
+
+def legacy_clean_data(df):
+    """The original multi-pass clean_data, kept here as the baseline"""
+    df = df[df['address'].notna() & (df['address'].str.strip() != '')]
+    df = df.drop_duplicates(subset=['mandi_name', 'address'], keep='first')
+    for col in ['mandi_name', 'address', 'contact_details']:
+        if col in df.columns:
+            df[col] = df[col].astype(str).str.strip()
+            df[col] = df[col].replace('nan', '')
+    invalid_mandi_names = ['', 'unknown', 'element_', 'debug_', 'nan', 'none']
+    df = df[~df['mandi_name'].str.lower().isin(invalid_mandi_names)]
+    df = df[~df['mandi_name'].str.lower().str.startswith('element_')]
+    df = df[~df['mandi_name'].str.lower().str.startswith('debug_')]
+    df = df[(df['mandi_name'].str.len() > 3) | (df['address'].str.len() > 20)]
+    return df.reset_index(drop=True)
+
+
+def make_frame(rows, seed=0):
+    """Synthetic raw records with the duplicate/noise mix a real run produces"""
+    rng = np.random.default_rng(seed)
+    unique = max(1, rows // 4)  # each mandi is extracted ~4 times
+    ids = rng.integers(0, unique, rows)
+    states = np.array(['Gujarat', 'Maharashtra', 'Uttar Pradesh', 'Rajasthan', 'Karnataka'])
+    names = np.array([f" APMC Mandi {i} " for i in range(unique)], dtype=object)
+    addresses = np.array([f"Market Yard, Station Road, PIN {360000 + i % 99999}" for i in range(unique)],
+                         dtype=object)
+    name_col = names[ids]
+    name_col[rng.random(rows) < 0.05] = 'Unknown'
+    address_col = addresses[ids]
+    address_col[rng.random(rows) < 0.05] = None
+    return pd.DataFrame({
+        'state': states[ids % len(states)],
+        'district': np.array([f"District {i % 700}" for i in range(unique)], dtype=object)[ids],
+        'mandi_name': name_col,
+        'address': address_col,
+        'contact_details': np.where(rng.random(rows) < 0.5, '0281-2445566, apmc@example.com', ''),
+    })
+
+
+def bench(name, fn, df, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn(df)
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:>10}: {len(df) / best:>12,.0f} rows/sec  ({best:.2f}s, {len(out)} clean rows)")
+    return best, out
+
+
+def environment():
+    """One line to quote next to the numbers: the speedup depends on the machine and pandas build"""
+    return (f"Python {platform.python_version()}, pandas {pd.__version__}, numpy {np.__version__}, "
+            f"{platform.machine()}, {os.cpu_count()} CPUs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    print(environment())
+    print(f"Cleaning {len(df):,} synthetic rows (best of {args.repeat})")
+    legacy, expected = bench('legacy', legacy_clean_data, df, args.repeat)
+    current, out = bench('clean_data', lambda frame: clean_data(frame, verbose=False), df, args.repeat)
+    same = expected.astype(str).equals(out.astype(str))
+    print(f"Speedup: {legacy / current:.2f}x (output {'identical' if same else 'DIFFERS'})")
+
+
+if __name__ == "__main__":
+    main()
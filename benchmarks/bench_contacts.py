@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Benchmark the batch contact parser against the original filter + re-parse.
+
+The baseline is what we used to do: keep every short line with a digit in
+`contact_details`, then pull phones/emails/PINs out of that blob with separate
+regexes downstream.
+
+    PYTHONPATH=src python benchmarks/bench_contacts.py --lines 200000
+    PYTHONPATH=src python benchmarks/bench_contacts.py --lines 200000 --copies 4
+
+`add_contact_columns` runs after `clean_data` has dropped duplicates, so by
+default every line is distinct; `--copies 4` repeats each one like a raw,
+not yet de-duplicated frame.
+"""
+import argparse
+import os
+import platform
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from enam_scraper.contacts import parse_contacts
+
+DOWNSTREAM_PATTERNS = {
+    'landline': re.compile(r'0\d{2,4}[\s-]?\d{6,8}'),
+    'mobile': re.compile(r'(?:\+91[\s-]?)?[6-9]\d{4}\s?\d{5}'),
+    'email': re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+'),
+    'pin_code': re.compile(r'\b[1-9]\d{2}\s?\d{3}\b'),
+    'fax': re.compile(r'fax\W*([\d\s-]+)', re.IGNORECASE),
+}
+
+
+def legacy_extract_contact(text):
+    """The original digit-scanning filter from extract_contact_from_text"""
+    contact_info = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if 'contact' in line.lower() and ':' in line:
+            contact_info.append(line.split(':', 1)[1].strip())
+        elif '@' in line or any(char.isdigit() for char in line):
+            if len(line) < 50 and (line.count('@') == 1 or any(char.isdigit() for char in line)):
+                contact_info.append(line)
+    return ', '.join(contact_info)
+
+
+def legacy_parse(lines):
+    """Line filter, then one downstream regex pass per field"""
+    blobs = [legacy_extract_contact(line) for line in lines]
+    return {field: [', '.join(pattern.findall(blob)) for blob in blobs]
+            for field, pattern in DOWNSTREAM_PATTERNS.items()}
+
+
+def make_lines(count, copies=1, seed=0):
+    """Synthetic contact strings in the formats seen on the portal, each one `copies` times"""
+    rng = np.random.default_rng(seed)
+    templates = [
+        "0{std}-{number}, {mobile}, apmc{i}@example.com",
+        "Phone: (0{std}) {number} Fax: 0{std}-{fax}",
+        "Mobile: +91-{mobile} / 0{std} {number}",
+        "Secretary {i}, Market Yard - {pin}",
+        "",
+    ]
+    lines = []
+    for i in range(max(1, count // copies)):
+        std = str(rng.integers(20, 9999))
+        lines.append(templates[i % len(templates)].format(
+            i=i % 5000, std=std, number=str(rng.integers(10 ** (9 - len(std)), 10 ** (10 - len(std)))),
+            fax=str(rng.integers(10 ** (9 - len(std)), 10 ** (10 - len(std)))),
+            mobile=str(rng.integers(6_000_000_000, 9_999_999_999)), pin=str(rng.integers(110000, 855999))))
+    if copies == 1:
+        return lines
+    return [lines[i] for i in rng.integers(0, len(lines), count)]
+
+
+def bench(name, fn, repeat, count):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:>15}: {count / best:>12,.0f} lines/sec  ({best:.2f}s)")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--copies", type=int, default=1, help="Times each contact line repeats")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    lines = make_lines(args.lines, args.copies)
+    print(f"Python {platform.python_version()}, pandas {pd.__version__}, numpy {np.__version__}, "
+          f"{platform.machine()}, {os.cpu_count()} CPUs")
+    print(f"Parsing {len(lines):,} synthetic contact lines, {len(set(lines)):,} distinct "
+          f"(best of {args.repeat})")
+    legacy = bench('legacy', lambda: legacy_parse(lines), args.repeat, len(lines))
+    current = bench('parse_contacts', lambda: parse_contacts(lines), args.repeat, len(lines))
+    print(f"Speedup: {legacy / current:.2f}x")
+
+    parsed = parse_contacts(lines)
+    for field in parsed.columns:
+        print(f"  {field:>9}: {(parsed[field] != '').mean():.0%} of lines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Memory and build-time benchmark: raw records as dicts vs MandiRecord.
+
+    PYTHONPATH=src python benchmarks/bench_records.py --records 1000000
+
+Records are generated the way they reach the end of an all-India run: every
+field is a fresh string object, as it is for records read back from the
+ledger, the fingerprint store or a worker process. Reports the memory held by
+the records (tracemalloc) and the time to build them and the DataFrame.
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from enam_scraper.portal_server import STATES
+from enam_scraper.records import FIELDS, MandiRecord, records_frame
+
+
+def make_rows(count, seed=0):
+    """Field tuples over 28 states x 20 districts, 4 raw records per mandi"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(count):
+        mandi = i // 4
+        state = STATES[mandi % len(STATES)]
+        rows.append((state, f"{state[:4]} District {rng.integers(20)}", f"APMC Mandi {mandi}",
+                     f"Market Yard, Main Road, Town {mandi}, PIN {rng.integers(110000, 855999)}",
+                     f"0{rng.integers(20, 999)}-{rng.integers(1000000, 9999999)}, apmc{mandi}@example.com"))
+    return rows
+
+
+def fresh(value):
+    """A new string object with the same text (what a SQLite row or unpickling yields)"""
+    return (value + '.')[:-1]
+
+
+def as_dict(row):
+    return dict(zip(FIELDS, map(fresh, row)))
+
+
+def as_record(row):
+    return MandiRecord(*map(fresh, row))
+
+
+def measure(name, build, rows, to_frame):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    records = [build(row) for row in rows]
+    build_sec = time.perf_counter() - started
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    df = to_frame(records)
+    frame_sec = time.perf_counter() - started
+    assert len(df) == len(rows)
+    print(f"{name:>12}: {held / 2 ** 20:>8.1f} MB held  {held / len(rows):>6.0f} B/record  "
+          f"build {build_sec:.2f}s  DataFrame {frame_sec:.2f}s")
+    return held
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.records)
+    print(f"{len(rows):,} raw records")
+    dicts = measure('dict', as_dict, rows, pd.DataFrame)
+    compact = measure('MandiRecord', as_record, rows, records_frame)
+    print(f"Memory saved: {(dicts - compact) / 2 ** 20:.1f} MB ({1 - compact / dicts:.0%})")
+
+
+if __name__ == "__main__":
+    main()
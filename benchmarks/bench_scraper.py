@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""End-to-end scraper benchmark against the local stand-in portal (no network).
+
+    PYTHONPATH=src python benchmarks/bench_scraper.py --scenario district
+    PYTHONPATH=src python benchmarks/bench_scraper.py --scenario state --latency 0.3 --workers 2
+    PYTHONPATH=src python benchmarks/bench_scraper.py --scenario india --data enam_clean_data_1700000000.csv
+
+Starts `enam_scraper.portal_server` on a free port, runs the browser (or direct)
+engine against it and writes a JSON report with mandis/min, WebDriver calls per
+mandi (browser engine only), time per stage and peak RSS. Needs Chrome, like a
+real run.
+"""
+import argparse
+import json
+import os
+import resource
+import tempfile
+import threading
+import time
+
+from enam_scraper.metrics import Metrics
+from enam_scraper.portal_server import STATES, count_mandis, load_portal, serve_in_background, synthetic_portal
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# (states, max_districts): None means all of them
+SCENARIOS = {
+    'district': (1, 1),
+    'state': (1, None),
+    'india': (None, None),
+}
+
+
+class PeakRss:
+    """Peak resident memory of this process plus its children (Chrome, chromedriver)"""
+
+    def __init__(self, interval=0.2):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        process = psutil.Process()
+        while not self._stop.is_set():
+            total = 0
+            for proc in [process] + process.children(recursive=True):
+                try:
+                    total += proc.memory_info().rss
+                except psutil.Error:
+                    pass
+            self.peak = max(self.peak, total)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        if psutil:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if psutil:
+            self._thread.join()
+
+    def megabytes(self):
+        if psutil:
+            return round(self.peak / 2 ** 20, 1)
+        # Without psutil: this process plus the largest child that has exited (kB on Linux)
+        usage = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss +
+                 resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+        return round(usage / 1024, 1)
+
+
+def run_scenario(states, max_districts, engine, workers, base_url, metrics, all_states=False):
+    """Scrape the scenario's states; returns the number of clean records"""
+    from enam_scraper.direct import run_direct_scraper
+    from enam_scraper.scraper import run_focused_scraper
+
+    if all_states and engine == 'browser':
+        # One job over every state, largest districts first (what --all-states runs)
+        df = run_focused_scraper(None, max_districts=max_districts, workers=workers, base_url=base_url,
+                                 metrics=metrics)
+        return 0 if df is None else len(df)
+
+    records = 0
+    for state in states:
+        if engine == 'direct':
+            # Discovered (with Chrome) against the stand-in on the first state, replayed for the rest
+            df = run_direct_scraper(state, endpoints_path='bench_endpoints.json',
+                                    max_districts=max_districts, base_url=base_url)
+        else:
+            df = run_focused_scraper(state, max_districts=max_districts, workers=workers, base_url=base_url,
+                                     metrics=metrics)
+        records += 0 if df is None else len(df)
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=SCENARIOS, default='district')
+    parser.add_argument("--engine", choices=["browser", "direct"], default="browser")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--data", default=None, help="Recorded clean output to serve (default: generated)")
+    parser.add_argument("--districts", type=int, default=8, help="Generated districts per state")
+    parser.add_argument("--mandis", type=int, default=6, help="Generated mandis per district")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stand-in response delay (s)")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Extra random delay (s) up to this much")
+    parser.add_argument("--report", default=None, help="JSON report path (default: bench_<scenario>_<epoch>.json)")
+    args = parser.parse_args()
+
+    num_states, max_districts = SCENARIOS[args.scenario]
+    if args.data:
+        portal = load_portal(args.data)
+    else:
+        portal = synthetic_portal(num_states or len(STATES), args.districts, args.mandis)
+    states = list(portal)[:num_states]
+    mandis = count_mandis(portal, states, max_districts)
+    report_path = os.path.abspath(args.report or f"bench_{args.scenario}_{int(time.time())}.json")
+
+    server = serve_in_background(portal, port=0, latency=args.latency, jitter=args.jitter)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='enam_bench_') as workdir:
+        os.chdir(workdir)  # Keep the run's CSVs and endpoint maps out of the repo
+        try:
+            metrics = Metrics()
+            with PeakRss() as rss:
+                started = time.perf_counter()
+                records = run_scenario(states, max_districts, args.engine, args.workers, server.url, metrics,
+                                       all_states=num_states is None)
+                elapsed = time.perf_counter() - started
+        finally:
+            os.chdir(cwd)
+            server.shutdown()
+
+    report = {
+        'scenario': args.scenario,
+        'engine': args.engine,
+        'workers': args.workers,
+        'latency': args.latency,
+        'jitter': args.jitter,
+        'states': len(states),
+        'mandis': mandis,
+        'records': records,
+        'elapsed_sec': round(elapsed, 2),
+        'mandis_per_min': round(mandis / elapsed * 60, 1),
+        'webdriver_calls': metrics.count('webdriver_calls'),
+        'webdriver_calls_per_mandi': round(metrics.count('webdriver_calls') / mandis, 1) if mandis else None,
+        'seconds_by_stage': {name: round(metrics.totals(name)[1], 2) for name in ('webdriver', 'wait', 'extract')},
+        'peak_rss_mb': rss.megabytes(),
+        'portal_requests': dict(server.RequestHandlerClass.hits),
+    }
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    print(f"✓ Report written to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
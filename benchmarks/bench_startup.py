@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Startup-time check for the CLI: `--help` must not import pandas/selenium.
+
+    PYTHONPATH=src python benchmarks/bench_startup.py --runs 10 --budget-ms 300
+
+Starts fresh interpreters, times `python -m enam_scraper.cli --help` against
+importing `enam_scraper.scraper` (what every CLI call used to pay) and fails
+(exit 1) if the CLI pulls in a heavy module or its median start-up is over
+budget. Cheap enough to run in CI.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_CHECK = ("import sys, enam_scraper.cli as cli; cli.build_parser(); "
+               "print(','.join(m for m in cli.HEAVY_MODULES if m in sys.modules))")
+
+
+def time_command(command, runs):
+    """Median wall time (ms) of a fresh interpreter running `command`, None if it fails"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run([sys.executable] + command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                env=os.environ)
+        if result.returncode != 0:
+            return None
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=300, help="Fail if `--help` takes longer (median)")
+    args = parser.parse_args()
+
+    heavy = subprocess.run([sys.executable, "-c", HEAVY_CHECK], capture_output=True, text=True, check=True)
+    heavy = heavy.stdout.strip()
+    baseline = time_command(["-c", "pass"], args.runs)
+    cli_help = time_command(["-m", "enam_scraper.cli", "--help"], args.runs)
+    legacy = time_command(["-c", "import enam_scraper.scraper"], args.runs)
+
+    print(f"{'python -c pass':>34}: {baseline:>7.0f} ms")
+    print(f"{'enam_scraper.cli --help':>34}: {cli_help:>7.0f} ms")
+    if legacy is None:
+        print(f"{'import enam_scraper.scraper':>34}:    (failed: dependencies missing)")
+    else:
+        print(f"{'import enam_scraper.scraper':>34}: {legacy:>7.0f} ms  ({legacy / cli_help:.1f}x slower)")
+
+    ok = True
+    if heavy:
+        print(f"✗ `--help` imported heavy modules: {heavy}")
+        ok = False
+    if cli_help > args.budget_ms:
+        print(f"✗ `--help` took {cli_help:.0f} ms (budget {args.budget_ms:.0f} ms)")
+        ok = False
+    if ok:
+        print("✓ CLI starts without pandas/selenium and within budget")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,11 @@
 #!/usr/bin/env python3
-import argparse
-from datetime import datetime
-from enam_scraper.scraper import run_focused_scraper
+"""Backwards-compatible entry point: flags without a command run `scrape`.
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Extract India APMC mandi contact details from eNAM (https://enam.gov.in/web/apmc-contact-details)."
-    )
-    parser.add_argument("--state", default="Gujarat", help="State name as it appears on eNAM (e.g., 'Maharashtra')")
-    parser.add_argument("--max_districts", type=int, default=None, help="Limit number of districts processed (debug)")
-    args = parser.parse_args()
+See `python -m enam_scraper.cli --help` for all commands.
+"""
+import sys
 
-    print(f"[{datetime.now().isoformat(timespec='seconds')}] Starting scrape for state: {args.state}")
-    df = run_focused_scraper(state=args.state, max_districts=args.max_districts)
-    if df is None:
-        print("No data saved. Check logs above.")
-    else:
-        print("Done. See the CSV saved in the current directory.")
+from enam_scraper.cli import main
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main(default_command="scrape"))
@@ -0,0 +1,196 @@
+"""Address normalization with PIN-code validation and cross-checks.
+
+`normalize_address` turns free-text addresses into comparable keys: casefolded,
+punctuation dropped, PINs written as 6 digits and the common spellings of
+the same thing folded into one token:
+
+    "A.P.M.C. Market-Yard, Rajkot Rd., PIN 360 003"  -> "apmc market yard rajkot road 360003"
+    "Krushi Utpanna Bazar Samiti, Marketyard, Pune"  -> "apmc market yard pune"
+
+`resolve_pin` looks a PIN up in the bundled prefix index (data/pin_prefixes.csv:
+2-digit postal circles -> state(s), 3-digit overrides for split circles and the
+sorting districts of major mandi towns), and `check_pin` cross-checks it with
+the state/district the scraper assigned. `add_address_columns` works per
+unique address, PIN and (PIN, state, district), so millions of rows that
+repeat the same addresses cost little more than the uniques.
+`normalize_address` itself is memoized (bounded LRU) for the per-record
+callers - in-flight dedup keys, sink keys, near-duplicate shingles - that see
+each mandi several times.
+"""
+import csv
+import os
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+PIN_INDEX_PATH = os.path.join(os.path.dirname(__file__), 'data', 'pin_prefixes.csv')
+ADDRESS_FIELDS = ['address_normalized', 'pin_state', 'pin_check']
+CACHE_SIZE = 1 << 16
+
+# pin_check values
+PIN_OK = 'ok'
+PIN_MISSING = ''
+PIN_INVALID = 'invalid'
+STATE_MISMATCH = 'state_mismatch'
+DISTRICT_MISMATCH = 'district_mismatch'  # A hint only: sorting districts straddle revenue districts
+
+PIN_RE = re.compile(r'(?<!\d)([1-9]\d{2})\s?(\d{3})(?!\d)')
+PUNCTUATION_RE = re.compile(r'[^\w\s]+')
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Spellings of the same thing -> one canonical token (matched on casefolded text)
+CANONICAL_TOKENS = {
+    'apmc': (r'a\.?\s?p\.?\s?m\.?\s?c\b\.?'
+             r'|agricultur(?:e|al)\s+produce\s+market(?:ing)?\s+committee'
+             r'|kr[iu]shi\s+(?:utpann?a?|upaj|utpadan)\s+(?:ba[zj]aa?r|mandi)\s+samit(?:i|ee|y)'),
+    'market yard': r'(?:market|mkt\.?)\s*-?\s*yard',
+    'committee': r'comm?itt?ee|commit[iy]|comittee',
+    'road': r'rd\b\.?',
+    'district': r'dist(?:t|rict)?\b\.?',
+    'taluka': r'(?:taluka|tal|tq|tehsil|teh)\b\.?',
+    'near': r'nr\b\.?',
+    'opposite': r'opp\b\.?',
+    '': r'pin(?:\s*code)?\b\s*[:.-]?',
+}
+TOKEN_RE = re.compile('|'.join(f'(?P<t{i}>\\b(?:{pattern}))' for i, pattern in enumerate(CANONICAL_TOKENS.values())))
+TOKEN_REPLACEMENTS = {f't{i}': f' {token} ' for i, token in enumerate(CANONICAL_TOKENS)}
+
+# eNAM / older spellings of state names
+STATE_ALIASES = {
+    'uttrakhand': 'uttarakhand',
+    'uttaranchal': 'uttarakhand',
+    'orissa': 'odisha',
+    'pondicherry': 'puducherry',
+    'chattisgarh': 'chhattisgarh',
+    'tamilnadu': 'tamil nadu',
+    'nct of delhi': 'delhi',
+    'jammu kashmir': 'jammu and kashmir',
+}
+
+
+def _key(text):
+    text = PUNCTUATION_RE.sub(' ', str(text or '').casefold().replace('&', ' and '))
+    return WHITESPACE_RE.sub(' ', text).strip()
+
+
+def _state_key(state):
+    key = _key(state)
+    return STATE_ALIASES.get(key, key)
+
+
+def _load_index(path=PIN_INDEX_PATH):
+    """prefix -> (state keys, district keys) from the bundled CSV"""
+    index = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            states = tuple(_state_key(state) for state in row['states'].split('|'))
+            districts = tuple(_key(district) for district in row['districts'].split('|') if district)
+            index[row['prefix']] = (states, districts, row['states'])
+    return index
+
+
+PIN_INDEX = _load_index()
+
+
+def _canonical(text):
+    text = TOKEN_RE.sub(lambda match: TOKEN_REPLACEMENTS[match.lastgroup], str(text or '').casefold())
+    text = PIN_RE.sub(r'\1\2', text)
+    return _key(text)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_address(text):
+    """Comparable form of an address (see module docstring)"""
+    return _canonical(text)
+
+
+def resolve_pin(pin):
+    """(state keys, district keys, state label) for a 6-digit PIN, None if it is not a valid Indian PIN"""
+    if len(pin) != 6 or not pin.isdigit():
+        return None
+    base = PIN_INDEX.get(pin[:2])
+    if base is None:
+        return None
+    return PIN_INDEX.get(pin[:3], base)
+
+
+def valid_pin(pin):
+    return resolve_pin(pin) is not None
+
+
+def extract_pin(text):
+    """First valid PIN code in the text, '' if there is none"""
+    for first, rest in PIN_RE.findall(str(text or '')):
+        if valid_pin(first + rest):
+            return first + rest
+    return ''
+
+
+def _district_matches(district, known):
+    return any(name in district or district in name for name in known)
+
+
+def check_pin(pin, state, district):
+    """(state label from the PIN, pin_check) for a PIN and the state/district the scraper assigned"""
+    if not pin:
+        return '', PIN_MISSING
+    resolved = resolve_pin(pin)
+    if resolved is None:
+        return '', PIN_INVALID
+    states, districts, label = resolved
+    if state and _state_key(state) not in states:
+        return label, STATE_MISMATCH
+    if district and districts and not _district_matches(_key(district), districts):
+        return label, DISTRICT_MISMATCH
+    return label, PIN_OK
+
+
+def _valid_pins(pins):
+    """Keep only the valid PINs of a '; '-joined pin_code value"""
+    return '; '.join(pin for pin in pins.split('; ') if valid_pin(pin))
+
+
+def add_address_columns(df):
+    """Validate `pin_code` and add the normalized address and PIN cross-check columns
+
+    `pin_code` (from add_contact_columns) keeps only valid PINs and falls back
+    to the first valid PIN in the address.
+    """
+    codes, uniques = pd.factorize(df['address'].fillna('').astype(str).to_numpy(dtype=object))
+    # Already one call per unique address: the LRU cache would only be churned
+    normalized = np.array([_canonical(text) for text in uniques] + [''], dtype=object)
+    address_pins = np.array([extract_pin(text) for text in uniques] + [''], dtype=object)
+    address_has_pin = np.array([PIN_RE.search(text) is not None for text in uniques] + [False])
+    df['address_normalized'] = normalized[codes]
+
+    found = address_has_pin[codes]
+    pins = address_pins[codes]
+    if 'pin_code' in df.columns:
+        raw = df['pin_code'].fillna('').astype(str).to_numpy(dtype=object)
+        pin_codes, pin_uniques = pd.factorize(raw)
+        valid = np.array([_valid_pins(pins) for pins in pin_uniques] + [''], dtype=object)[pin_codes]
+        found = found | (raw != '')
+        pins = np.where(valid == '', pins, valid)
+    df['pin_code'] = pins
+
+    states = df['state'].astype(str).to_numpy(dtype=object)
+    districts = df['district'].astype(str).to_numpy(dtype=object)
+    checks = []
+    seen = {}  # Rows repeat a few (PIN, state, district) combinations
+    for row in zip(pins, found, states, districts):
+        check = seen.get(row)
+        if check is None:
+            pin, has_pin, state, district = row
+            check = seen[row] = (check_pin(pin.split('; ', 1)[0], state, district) if pin
+                                 else ('', PIN_INVALID if has_pin else PIN_MISSING))
+        checks.append(check)
+    df['pin_state'] = [label for label, _ in checks]
+    df['pin_check'] = [check for _, check in checks]
+    return df
+
+
+def cache_info():
+    """Hit/miss counts of the memoized `normalize_address`"""
+    return normalize_address.cache_info()
@@ -0,0 +1,113 @@
+"""Compressed, content-addressed archive of raw page snapshots.
+
+Every page the scraper extracts from can be stored here, so extraction and
+cleaning heuristics can be re-run offline (`reextract_archive`) without
+starting Chrome. Layout:
+
+    <root>/index.jsonl                  one line per captured page
+    <root>/blobs/ab/abcdef....html.zst  page HTML, stored once per content hash
+
+Blobs use zstd when the `zstandard` package is installed and gzip otherwise.
+"""
+import gzip
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from enam_scraper import extraction
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+INDEX_FILE = 'index.jsonl'
+
+
+class SnapshotArchive:
+    def __init__(self, root, mode='w'):
+        """`mode='w'` creates the archive if needed; `mode='r'` requires an existing one"""
+        self.root = root
+        self.blob_dir = os.path.join(root, 'blobs')
+        self.index_path = os.path.join(root, INDEX_FILE)
+        if mode == 'w':
+            os.makedirs(self.blob_dir, exist_ok=True)
+        elif not os.path.exists(self.index_path):
+            raise FileNotFoundError(f"No snapshot archive at {root} ({INDEX_FILE} missing)")
+
+    def _blob_path(self, digest, ext):
+        return os.path.join(self.blob_dir, digest[:2], f"{digest}.html.{ext}")
+
+    def _find_blob(self, digest):
+        for ext in ('zst', 'gz'):
+            path = self._blob_path(digest, ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def add(self, html, state, district, mandi=None):
+        """Store a page snapshot and index it; returns its content hash"""
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+
+        if self._find_blob(digest) is None:
+            ext = 'zst' if zstandard else 'gz'
+            path = self._blob_path(digest, ext)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            compressed = zstandard.ZstdCompressor(level=10).compress(data) if zstandard else gzip.compress(data)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+
+        entry = {'state': state, 'district': district, 'mandi': mandi or '',
+                 'digest': digest, 'captured_at': int(time.time())}
+        # Single small append per line, safe with several worker processes
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+        return digest
+
+    def read(self, digest):
+        """Return the HTML for a content hash"""
+        path = self._find_blob(digest)
+        if path is None:
+            raise KeyError(digest)
+        with open(path, 'rb') as f:
+            data = f.read()
+        if path.endswith('.zst'):
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read .zst snapshots")
+            data = zstandard.ZstdDecompressor().decompress(data)
+        else:
+            data = gzip.decompress(data)
+        return data.decode('utf-8')
+
+    def entries(self, latest_only=True):
+        """Indexed snapshots, by default only the latest per (state, district, mandi)"""
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        if not latest_only:
+            return entries
+        latest = {}
+        for entry in entries:
+            latest[(entry['state'], entry['district'], entry['mandi'])] = entry
+        return list(latest.values())
+
+
+def _reextract_entry(args):
+    root, entry = args
+    html = SnapshotArchive(root, mode='r').read(entry['digest'])
+    return extraction.extract_records(html, entry['state'], entry['district'], entry['mandi'] or None)
+
+
+def reextract_archive(root, workers=None):
+    """Re-run extraction over archived snapshots in parallel and return raw records"""
+    entries = SnapshotArchive(root, mode='r').entries()
+    print(f"Re-extracting {len(entries)} snapshots from {root}...")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_reextract_entry, [(root, entry) for entry in entries], chunksize=16)
+        return [record for records in results for record in records]
@@ -0,0 +1,87 @@
+"""Cleaning and filtering of raw extracted records.
+
+`clean_data` normalizes each text column once (per unique value) and combines
+every filter into a single boolean mask, so the frame is copied only once
+however many rows we merge. `state`/`district` come back as categoricals.
+"""
+import numpy as np
+import pandas as pd
+
+TEXT_COLUMNS = ['mandi_name', 'address', 'contact_details']
+CATEGORY_COLUMNS = ['state', 'district']
+INVALID_MANDI_NAMES = ['', 'unknown', 'element_', 'debug_', 'nan', 'none']
+INVALID_MANDI_PREFIXES = ('element_', 'debug_')
+
+
+def _normalize_text(series):
+    """Strip once; missing values and literal 'nan' become ''"""
+    series = series.fillna('').astype(str).str.strip()
+    return series.mask(series == 'nan', '')
+
+
+def _factorize_text(series):
+    """Integer codes + normalized unique values for a text column
+
+    Raw records repeat the same strings many times (every mandi is extracted by
+    several methods), so normalizing the uniques is far cheaper than the rows.
+    """
+    codes, uniques = pd.factorize(series)
+    normalized = _normalize_text(pd.Series(uniques, dtype=object)).to_numpy(dtype=object)
+    # Missing values get code -1, which now points at the trailing ''
+    normalized = np.append(normalized, '')
+    # Different raw strings can normalize to the same value (' APMC' / 'APMC')
+    canonical, uniques = pd.factorize(normalized)
+    return canonical[codes], np.asarray(uniques, dtype=object)
+
+
+def clean_data(df, verbose=True):
+    """Clean and filter the extracted data"""
+    log = print if verbose else (lambda *args: None)
+    log(f"Cleaning data: {len(df)} raw records")
+
+    text = {col: _factorize_text(df[col]) for col in TEXT_COLUMNS if col in df.columns}
+    name_codes, names = text['mandi_name']
+    address_codes, addresses = text['address']
+    names_lower = pd.Series(names, dtype=object).str.lower()
+    address_len = pd.Series(addresses, dtype=object).str.len().to_numpy()
+
+    # Remove records without address
+    has_address = (addresses != '')[address_codes]
+    # Remove records where mandi_name is empty or just generic text
+    valid_name = ~(names_lower.isin(INVALID_MANDI_NAMES) |
+                   names_lower.str.startswith(INVALID_MANDI_PREFIXES)).to_numpy(dtype=bool)[name_codes]
+    # Ensure minimum data quality - must have either mandi_name or meaningful address
+    quality = ((names_lower.str.len().to_numpy() > 3)[name_codes] |
+               (address_len > 20)[address_codes])
+
+    mask = has_address & valid_name & quality
+    # Remove duplicate records (same mandi_name + address) among the survivors
+    keys = name_codes.astype(np.int64) * len(addresses) + address_codes
+    survivors = np.flatnonzero(mask)
+    duplicate = pd.Series(keys[survivors]).duplicated(keep='first').to_numpy()
+    mask[survivors[duplicate]] = False
+
+    log(f"Dropped {int((~has_address).sum())} without address, "
+        f"{int((has_address & ~valid_name).sum())} with generic mandi names, "
+        f"{int((has_address & valid_name & ~quality).sum())} low quality, "
+        f"{int(duplicate.sum())} duplicates")
+
+    out = {}
+    for col in df.columns:
+        if col in text:
+            codes, uniques = text[col]
+            out[col] = uniques[codes[mask]]
+        elif col in CATEGORY_COLUMNS:
+            out[col] = pd.Categorical(df[col].to_numpy()[mask])
+        else:
+            out[col] = df[col].to_numpy()[mask]
+    df = pd.DataFrame(out, columns=df.columns)
+    log(f"After cleaning: {len(df)} records")
+
+    return df
+
+
+def write_partitioned_parquet(df, root, partition_cols=('state',)):
+    """Write a clean frame as a Parquet dataset partitioned by state (requires pyarrow)"""
+    df.to_parquet(root, partition_cols=list(partition_cols), index=False)
+    print(f"✓ Wrote {len(df)} records to {root} partitioned by {', '.join(partition_cols)}")
@@ -0,0 +1,334 @@
+"""Command-line interface: `python -m enam_scraper.cli <command> ...`
+
+    scrape     drive the portal with Chrome (or replay its endpoints with --engine direct)
+    reextract  re-run extraction + cleaning over a snapshot archive (no Chrome)
+    clean      clean + de-duplicate record files (.csv/.jsonl/.parquet) into one output
+    merge      combine outputs of several runs into one file; later files win per mandi
+    index      upsert outputs into the indexed SQLite store (enam_scraper.store)
+    query      search the store (or filter an output file) by state, district, PIN prefix or text
+
+pandas, selenium and BeautifulSoup are only imported inside the command that
+needs them, so `--help` and cron wrappers start without paying for them.
+`benchmarks/bench_startup.py` checks that this stays true.
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+
+ENAM_URL = "https://enam.gov.in/web/apmc-contact-details"  # Same as enam_scraper.scraper.ENAM_URL
+
+COMMANDS = ('scrape', 'reextract', 'clean', 'merge', 'index', 'query')
+STORE_EXTENSIONS = ('.sqlite', '.sqlite3', '.db')
+
+# Imported by nothing reachable from `--help`
+HEAVY_MODULES = ('pandas', 'selenium', 'bs4', 'numpy')
+
+
+def _log(message):
+    print(f"[{datetime.now().isoformat(timespec='seconds')}] {message}")
+
+
+def _states(value):
+    """State names from a comma-separated --state value"""
+    return [state.strip() for state in value.split(',') if state.strip()]
+
+
+def cmd_scrape(args):
+    if args.reextract:
+        # Old `run_scraper.py --reextract ARCHIVE` spelling
+        args.archive_root = args.reextract
+        return cmd_reextract(args)
+
+    _log("Starting scrape for " + ("all states" if args.all_states else f"state: {args.state}"))
+    df = None
+    if args.engine == "direct":
+        from enam_scraper.direct import run_direct_scraper
+        df = run_direct_scraper(state=args.state, endpoints_path=args.endpoints,
+                                max_districts=args.max_districts, rate=args.rate,
+                                base_url=None if args.base_url == ENAM_URL else args.base_url)
+    else:
+        import pandas as pd
+
+        from enam_scraper.metrics import Metrics
+        from enam_scraper.scraper import FocusedEnamScraper, run_focused_scraper, save_incremental
+        from enam_scraper.sinks import open_sink, read_output
+
+        metrics = Metrics(args.metrics_log)
+        states = [None] if args.all_states else _states(args.state)  # None: every state, see enam_scraper.national
+        scraper = None
+        if len(states) > 1 and args.workers == 1 and not (args.concurrency or args.rate):
+            # One warmed driver for every state instead of a fresh Chrome per state
+            scraper = FocusedEnamScraper(base_url=args.base_url, metrics=metrics, lean=args.lean, keep_open=True)
+        # Several states stream into one sink: reopening the output per state would replace it
+        sink = open_sink(args.output) if args.output and len(states) > 1 else None
+        started = time.time()
+        results = []
+        try:
+            for state in states:
+                result = run_focused_scraper(state=state, max_districts=args.max_districts, workers=args.workers,
+                                             archive_dir=args.archive, ledger_path=args.ledger, resume=args.resume,
+                                             fingerprints_path=args.incremental,
+                                             output_path=None if sink else args.output, sink=sink,
+                                             base_url=args.base_url, metrics=metrics, lean=args.lean,
+                                             scraper=scraper, concurrency=args.concurrency, rate=args.rate,
+                                             retries=args.retries)
+                if result is not None and sink is None:
+                    results.append(result)
+                    if args.store:
+                        _index(args.store, [result])
+        finally:
+            if scraper:
+                scraper.close()
+            if sink:
+                sink.close()
+        if sink and sink.written:
+            df = args.output
+            if args.store:
+                _index(args.store, [df])
+            if args.incremental:
+                save_incremental(read_output(df), args.incremental, started)
+        elif len(results) == 1:
+            df = results[0]
+        elif results:
+            # Separate CSVs per state: --parquet-dir gets all of them
+            df = pd.concat([read_output(result) if isinstance(result, str) else result for result in results],
+                           ignore_index=True)
+        if args.metrics_prom:
+            metrics.write_prometheus(args.metrics_prom)
+        metrics.close()
+    if df is not None and args.parquet_dir:
+        from enam_scraper.cleaning import write_partitioned_parquet
+        from enam_scraper.sinks import read_output
+        write_partitioned_parquet(read_output(df) if isinstance(df, str) else df, args.parquet_dir)
+
+    if df is None:
+        print("No data saved. Check logs above.")
+    elif args.output and args.engine == "browser":
+        print(f"Done. Clean records streamed to {args.output}.")
+    else:
+        print("Done. See the CSV saved in the current directory.")
+
+
+def cmd_reextract(args):
+    from enam_scraper.archive import reextract_archive
+    from enam_scraper.scraper import save_records
+
+    _log(f"Re-extracting archive: {args.archive_root}")
+    try:
+        records = reextract_archive(args.archive_root, workers=args.workers if args.workers > 1 else None)
+    except FileNotFoundError as e:
+        raise SystemExit(f"✗ {e}")
+    df = save_records(records, output_path=getattr(args, 'output', None))
+    print("Done." if df is not None else "No data saved. Check logs above.")
+
+
+def _read_inputs(paths):
+    import pandas as pd
+
+    from enam_scraper.records import FIELDS
+    from enam_scraper.sinks import read_output
+
+    frames = []
+    for path in paths:
+        df = read_output(path).fillna('').astype(str)
+        missing = [field for field in FIELDS if field not in df.columns]
+        if missing:
+            raise SystemExit(f"✗ {path} has no {', '.join(missing)} column(s)")
+        print(f"✓ Read {len(df)} records from {path}")
+        frames.append(df[list(FIELDS)])
+    return pd.concat(frames, ignore_index=True)
+
+
+def cmd_clean(args):
+    from enam_scraper.scraper import save_records
+
+    save_records(_read_inputs(args.inputs), output_path=args.output)
+
+
+def cmd_merge(args):
+    from enam_scraper.addresses import add_address_columns
+    from enam_scraper.contacts import add_contact_columns
+    from enam_scraper.dedup import normalize_text
+    from enam_scraper.sinks import write_output
+
+    df = _read_inputs(args.inputs)
+    # The same mandi in several runs: keep it from the last file given
+    keys = df['state'].map(normalize_text) + '|' + df['district'].map(normalize_text) + '|' + \
+        df['mandi_name'].map(normalize_text)
+    merged = add_address_columns(add_contact_columns(df[~keys.duplicated(keep='last')].reset_index(drop=True)))
+    write_output(merged, args.output)
+    print(f"✓ Merged {len(df)} records from {len(args.inputs)} files into {len(merged)} in {args.output}")
+
+
+def _index(store_path, outputs):
+    """Upsert clean DataFrames (or output files) into the store"""
+    from enam_scraper.sinks import read_output
+    from enam_scraper.store import MandiStore
+
+    with MandiStore(store_path) as store:
+        for output in outputs:
+            store.upsert(read_output(output) if isinstance(output, str) else output)
+
+
+def cmd_index(args):
+    _index(args.store, args.inputs)
+
+
+def cmd_query(args):
+    started = time.perf_counter()
+    if args.source.lower().endswith(STORE_EXTENSIONS):
+        from enam_scraper.store import MandiStore
+
+        with MandiStore(args.source) as store:
+            rows = store.search(args.state, args.district, args.pin, args.text, args.limit)
+    else:
+        rows = _query_file(args)
+    _print_rows(rows, args.format, time.perf_counter() - started)
+
+
+def _query_file(args):
+    """Same filters over a .csv/.jsonl/.parquet output (loads the whole file)"""
+    import pandas as pd
+
+    from enam_scraper.sinks import read_output
+
+    df = read_output(args.source).fillna('').astype(str)
+    mask = pd.Series(True, index=df.index)
+    if args.state:
+        mask &= df['state'].str.lower() == args.state.lower()
+    if args.district:
+        mask &= df['district'].str.lower() == args.district.lower()
+    if args.pin:
+        pins = df['pin_code'] if 'pin_code' in df.columns else df['address'].str.extract(r'(\d{6})')[0].fillna('')
+        mask &= pins.str.startswith(args.pin)
+    if args.text:
+        text = args.text.lower()
+        mask &= (df['mandi_name'].str.lower().str.contains(text, regex=False) |
+                 df['address'].str.lower().str.contains(text, regex=False))
+    return df[mask].head(args.limit).to_dict('records')
+
+
+def _print_rows(rows, fmt, elapsed):
+    if fmt == 'json':
+        import json
+        for row in rows:
+            print(json.dumps(row, ensure_ascii=False))
+    elif fmt == 'csv':
+        import csv
+        if rows:
+            writer = csv.DictWriter(sys.stdout, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        for row in rows:
+            print(f"{row['mandi_name']} | {row['district']}, {row['state']} | {row['address']} | "
+                  f"{row['contact_details']}")
+    print(f"({len(rows)} results in {elapsed * 1000:.1f} ms)", file=sys.stderr)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="enam_scraper",
+        description="Extract India APMC mandi contact details from eNAM (https://enam.gov.in/web/apmc-contact-details)."
+    )
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    scrape = commands.add_parser("scrape", help="Scrape the portal (needs Chrome unless --engine direct)")
+    scrape.add_argument("--state", default="Gujarat",
+                        help="State name as it appears on eNAM (e.g., 'Maharashtra'); comma-separate several "
+                             "states to scrape them one after another with the same Chrome")
+    scrape.add_argument("--all-states", action="store_true",
+                        help="Scrape every state in the portal's dropdown as one job into one output (ignores --state)")
+    scrape.add_argument("--max_districts", type=int, default=None, help="Limit number of districts processed (debug)")
+    scrape.add_argument("--workers", type=int, default=1, help="Number of parallel Chrome workers (capped per host)")
+    scrape.add_argument("--concurrency", type=int, default=None,
+                        help="Drivers run by the asyncio scheduler (shares one --rate budget; capped per host)")
+    scrape.add_argument("--rate", type=float, default=None,
+                        help="Portal requests/sec across all drivers (enables the asyncio scheduler, default 2); "
+                             "also paces --engine direct")
+    scrape.add_argument("--retries", type=int, default=None,
+                        help="Retries per failed district with the asyncio scheduler (default 3)")
+    scrape.add_argument("--engine", choices=["browser", "direct"], default="browser",
+                        help="'direct' replays the portal's XHR endpoints instead of driving Chrome")
+    scrape.add_argument("--endpoints", default="enam_endpoints.json",
+                        help="Endpoint map for --engine direct (discovered with Chrome if missing)")
+    scrape.add_argument("--lean", action="store_true",
+                        help="Lean Chrome: eager page load, no images/fonts/trackers")
+    scrape.add_argument("--base-url", default=ENAM_URL,
+                        help="Contact page to scrape (e.g. a local stand-in portal for benchmarks)")
+    scrape.add_argument("--archive", default=None, help="Store compressed page snapshots in this directory")
+    scrape.add_argument("--ledger", default=None,
+                        help="SQLite work ledger; records are committed per mandi as they are extracted")
+    scrape.add_argument("--resume", action="store_true",
+                        help="Skip units already done in the ledger and retry failed ones")
+    scrape.add_argument("--incremental", metavar="FINGERPRINTS", default=None,
+                        help="Fingerprint store; skip unchanged pages and write a delta CSV next to the snapshot")
+    scrape.add_argument("--output", default=None,
+                        help="Stream clean records to this .csv/.jsonl/.parquet file while scraping")
+    scrape.add_argument("--parquet-dir", default=None,
+                        help="Also write the clean records as a Parquet dataset partitioned by state")
+    scrape.add_argument("--metrics-log", default=None,
+                        help="Append per-stage timing spans to this JSON-lines file")
+    scrape.add_argument("--metrics-prom", default=None,
+                        help="Write run totals to this Prometheus textfile at the end")
+    scrape.add_argument("--store", default=None,
+                        help="Also upsert the clean records into this indexed SQLite store (see `index`/`query`)")
+    scrape.add_argument("--reextract", metavar="ARCHIVE", default=None, help=argparse.SUPPRESS)
+    scrape.set_defaults(func=cmd_scrape)
+
+    reextract = commands.add_parser("reextract", help="Re-run extraction + cleaning over an archive (no Chrome)")
+    reextract.add_argument("archive_root", metavar="ARCHIVE", help="Directory written by scrape --archive")
+    reextract.add_argument("--workers", type=int, default=1, help="Extraction processes")
+    reextract.add_argument("--output", default=None, help="Clean output file (default: enam_clean_data_{epoch}.csv)")
+    reextract.set_defaults(func=cmd_reextract)
+
+    clean = commands.add_parser("clean", help="Clean + de-duplicate record files into one output")
+    clean.add_argument("inputs", nargs="+", help="Raw or clean .csv/.jsonl/.parquet files")
+    clean.add_argument("--output", default=None, help="Clean output file (default: enam_clean_data_{epoch}.csv)")
+    clean.set_defaults(func=cmd_clean)
+
+    merge = commands.add_parser("merge", help="Combine outputs of several runs; later files win per mandi")
+    merge.add_argument("inputs", nargs="+", help="Clean .csv/.jsonl/.parquet files, oldest first")
+    merge.add_argument("--output", required=True, help="Merged .csv/.jsonl/.parquet file")
+    merge.set_defaults(func=cmd_merge)
+
+    index = commands.add_parser("index", help="Upsert clean outputs into the indexed SQLite store")
+    index.add_argument("store", help="Store file (created if missing), e.g. enam_mandis.sqlite")
+    index.add_argument("inputs", nargs="+", help="Clean .csv/.jsonl/.parquet files, oldest first")
+    index.set_defaults(func=cmd_index)
+
+    query = commands.add_parser("query", help="Search the store or filter an output file")
+    query.add_argument("source", help="Store (.sqlite/.db) or clean .csv/.jsonl/.parquet file")
+    query.add_argument("--state", default=None)
+    query.add_argument("--district", default=None)
+    query.add_argument("--pin", default=None, help="PIN code or prefix (e.g. 360)")
+    query.add_argument("--text", default=None,
+                       help="Words in the mandi name or address (full-text prefix match in a store, "
+                            "substring in a file)")
+    query.add_argument("--limit", type=int, default=50)
+    query.add_argument("--format", choices=["table", "csv", "json"], default="table")
+    query.set_defaults(func=cmd_query)
+    return parser
+
+
+def main(argv=None, default_command=None):
+    """Run a command; `default_command` is assumed when argv starts with an option (old flag-only CLI)"""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = build_parser()
+    if default_command and (not argv or argv[0] not in COMMANDS and argv[0] not in ('-h', '--help')):
+        argv = [default_command] + argv
+    args = parser.parse_args(argv)
+    if args.command == "scrape":
+        if not args.all_states and not _states(args.state):
+            parser.error("--state needs at least one state name")
+        if args.all_states and args.engine == "direct":
+            parser.error("--all-states needs the browser engine")
+        if args.all_states and (args.concurrency or args.rate):
+            parser.error("--all-states balances districts over --workers; --concurrency/--rate apply to single states")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
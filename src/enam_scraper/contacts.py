@@ -0,0 +1,122 @@
+"""Structured parsing of mandi contact details.
+
+`contact_details` is free text like "0281-2445566, 98250 12345, apmc@example.com".
+All patterns are compiled once into a single alternation, and `parse_contacts`
+runs it over a whole column in one pass to produce typed columns:
+
+    landline   0281-2445566      STD code + subscriber number
+    mobile     9825012345        10 digits, country code dropped
+    email      apmc@example.com  lowercased
+    pin_code   360003            from the contact text, else from the address
+    fax        0281-2445567
+
+Several values of one kind are joined with '; '.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+CONTACT_FIELDS = ['landline', 'mobile', 'email', 'pin_code', 'fax']
+SEPARATOR = '; '
+
+_STD_NUMBER = r'(?:\+91[\s.-]*\(?0?|\(?0){std}\)?[\s.-]*{number}'
+CONTACT_RE = re.compile(
+    r'(?P<email>[\w.+-]+@[\w-]+(?:\.[\w-]+)+)'
+    r'|fax[^\w\0]{0,3}(?:no[^\w\0]{0,3})?' +  # Not \W: must not run into the next row
+    _STD_NUMBER.format(std=r'(?P<fax_std>[1-9]\d{1,3})', number=r'(?P<fax_number>\d{6,8})(?!\d)') +
+    r'|(?<!\d)(?:(?:\+|00)?91[\s.-]*|0)?(?P<mobile>[6-9]\d{4}[\s.-]?\d{5})(?!\d)'
+    r'|(?<!\d)' +
+    _STD_NUMBER.format(std=r'(?P<std>[1-9]\d{1,3})', number=r'(?P<number>\d{6,8})(?!\d)') +
+    r'|(?<!\d)(?P<pin>[1-9]\d{2}\s?\d{3})(?!\d)',
+    re.IGNORECASE)
+# Separates the rows of a column scanned in one pass; no CONTACT_RE match can span it
+ROW_BREAK = '\0'
+BATCH_RE = re.compile(CONTACT_RE.pattern + r'|(?P<row>\0)', re.IGNORECASE)
+# Lines worth keeping as contact text: an email, phone or fax number, not just any digit
+CONTACT_LINE_RE = re.compile(
+    r'@|fax|(?<!\d)(?:\+91|0)?[\s.(-]*[1-9][\d\s.)-]{8,14}\d(?!\d)', re.IGNORECASE)
+PIN_CODE_RE = re.compile(r'(?<!\d)([1-9]\d{2})\s?(\d{3})(?!\d)')
+NON_DIGIT_RE = re.compile(r'\D')
+
+
+def _phones(std, number):
+    """'0' + STD code + '-' + number, only for valid 10-digit (without 0) numbers"""
+    return ('0' + std + '-' + number).where(std.str.len() + number.str.len() == 10, '')
+
+
+def _joined(rows, values, count):
+    """Distinct non-empty values of each row, in match order, joined with SEPARATOR"""
+    frame = pd.DataFrame({'row': rows, 'value': values})
+    frame = frame[frame['value'] != ''].drop_duplicates()
+    wide = frame.set_index(['row', frame.groupby('row').cumcount()])['value'].unstack()
+    joined = np.full(count, '', dtype=object)
+    if len(wide):
+        out = wide[0]
+        for position in wide.columns[1:]:
+            more = wide[position]
+            out = out.where(more.isna(), out + SEPARATOR + more)
+        joined[wide.index.to_numpy()] = out.to_numpy()
+    return joined
+
+
+def parse_contacts(contacts, addresses=None):
+    """Typed contact columns for a column of contact text (and optional addresses)
+
+    The distinct values are joined with ROW_BREAK and scanned by one `findall`
+    (BATCH_RE: CONTACT_RE plus a group matching the row breaks), so the regex
+    work is a single C-level pass with no per-row Python. Each match lands in
+    exactly one named group; the row breaks number the matches, and turning
+    groups into typed values and joining them per row are column operations.
+    """
+    contacts = pd.Series(contacts, dtype=object).fillna('').astype(str)
+    codes, uniques = pd.factorize(contacts)
+    count = len(uniques)
+    texts = uniques.tolist()
+    text = ROW_BREAK.join(texts)
+    if text.count(ROW_BREAK) != count - 1:
+        text = ROW_BREAK.join(text.replace(ROW_BREAK, '') for text in texts)
+    matches = pd.DataFrame(BATCH_RE.findall(text), columns=list(BATCH_RE.groupindex), dtype=object)
+    row = np.cumsum(matches['row'].to_numpy() != '')
+
+    def group(name, other=None):
+        """Row numbers and matches of one group (and the group matched with it)"""
+        hit = (matches[name] != '').to_numpy()
+        if other is None:
+            return row[hit], matches[name][hit]
+        return row[hit], matches[name][hit], matches[other][hit]
+
+    landline_rows, std, number = group('std', 'number')
+    mobile_rows, mobiles = group('mobile')
+    email_rows, emails = group('email')
+    pin_rows, pins = group('pin')
+    fax_rows, fax_std, fax_number = group('fax_std', 'fax_number')
+    columns = {
+        'landline': _joined(landline_rows, _phones(std, number), count),
+        'mobile': _joined(mobile_rows, mobiles.str.replace(NON_DIGIT_RE, '', regex=True), count),
+        'email': _joined(email_rows, emails.str.lower(), count),
+        'pin_code': _joined(pin_rows, pins.str.replace(' ', '', regex=False), count),
+        'fax': _joined(fax_rows, _phones(fax_std, fax_number), count),
+    }
+    columns = {field: values[codes] for field, values in columns.items()}
+    if addresses is not None:
+        pins = pd.Series(addresses, dtype=object).fillna('').astype(str).str.extract(PIN_CODE_RE).fillna('')
+        pins = (pins[0] + pins[1]).to_numpy(dtype=object)
+        columns['pin_code'] = np.where(columns['pin_code'] == '', pins, columns['pin_code'])
+    return pd.DataFrame(columns, index=contacts.index)
+
+
+def parse_contact(text, address=''):
+    """Typed contact fields for a single contact string"""
+    return parse_contacts([text], [address]).iloc[0].to_dict()
+
+
+def add_contact_columns(df):
+    """Append the typed contact columns to a clean frame"""
+    if len(df) == 0:
+        return df.assign(**{field: pd.Series(dtype=object) for field in CONTACT_FIELDS})
+    parsed = parse_contacts(df['contact_details'].to_numpy(dtype=object),
+                            df['address'].to_numpy(dtype=object))
+    for field in CONTACT_FIELDS:
+        df[field] = parsed[field].to_numpy()
+    return df
@@ -0,0 +1,195 @@
+"""Duplicate handling for extracted records.
+
+`DedupIndex` rejects exact duplicates in flight, on keys normalized for case,
+whitespace, punctuation and address spellings (addresses.normalize_address),
+before they are stored. `find_near_duplicates`
+catches address variants of the same mandi: records are blocked by district
+and validated PIN code, MinHash signatures over character shingles are bucketed with
+LSH, and only candidates sharing a bucket are compared, so it scales to
+all-India datasets without comparing every pair.
+"""
+import re
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from enam_scraper.addresses import extract_pin, normalize_address
+
+PUNCTUATION_RE = re.compile(r'[^\w\s]+')
+WHITESPACE_RE = re.compile(r'\s+')
+# Field labels that element extraction leaves in front of a name ("Mandi Name APMC Rajkot")
+NAME_LABEL_RE = re.compile(r'^(?:(?:mandi|market|apmc)\s+name|name\s+of\s+(?:the\s+)?(?:mandi|market|apmc))\b\s*')
+
+SHINGLE_SIZE = 4
+NUM_PERM = 64
+BANDS = 16  # 16 bands x 4 rows: pairs above ~0.5 Jaccard usually share a bucket
+NEAR_DUP_THRESHOLD = 0.85
+_MERSENNE = (1 << 61) - 1
+
+
+def normalize_text(text):
+    """Casefold, drop punctuation and collapse whitespace"""
+    text = PUNCTUATION_RE.sub(' ', str(text or '').casefold())
+    return WHITESPACE_RE.sub(' ', text).strip()
+
+
+def record_key(record):
+    return normalize_text(record['mandi_name']), normalize_address(record['address'])
+
+
+class DedupIndex:
+    """Keys of the records kept so far
+
+    Keys added for a unit stay provisional until `commit(unit)`: if the unit
+    fails, `discard(unit)` forgets them so a retry can extract the same
+    records again instead of rejecting them as duplicates.
+    """
+
+    def __init__(self):
+        self.keys = set()
+        self.pending = {}  # key -> unit that added it, until that unit commits
+        self.rejected = 0
+
+    def add(self, record, unit=None):
+        """Remember a record; False if an equivalent one was already added"""
+        key = hash(record_key(record))
+        if key in self.keys or key in self.pending:
+            self.rejected += 1
+            return False
+        if unit is None:
+            self.keys.add(key)
+        else:
+            self.pending[key] = unit
+        return True
+
+    def commit(self, unit):
+        """Make the keys added for a unit permanent"""
+        keys = [key for key, owner in self.pending.items() if owner == unit]
+        for key in keys:
+            del self.pending[key]
+        self.keys.update(keys)
+
+    def discard(self, unit):
+        """Forget the keys added for a unit that failed"""
+        self.pending = {key: owner for key, owner in self.pending.items() if owner != unit}
+
+    def __len__(self):
+        return len(self.keys) + len(self.pending)
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    compact = normalize_address(text).replace(' ', '')
+    if len(compact) <= size:
+        return {compact} if compact else set()
+    return {compact[i:i + size] for i in range(len(compact) - size + 1)}
+
+
+class MinHasher:
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = np.random.default_rng(seed)
+        # a < 2**31 keeps a*x + b below 2**64 for 32-bit shingle hashes
+        self.a = rng.integers(1, 1 << 31, num_perm, dtype=np.uint64)[:, None]
+        self.b = rng.integers(0, _MERSENNE, num_perm, dtype=np.uint64)[:, None]
+
+    def signatures(self, shingle_sets, batch_size=20000):
+        """MinHash signature matrix (one row per shingle set), computed in batches"""
+        result = np.zeros((len(shingle_sets), len(self.a)), dtype=np.uint64)
+        for start in range(0, len(shingle_sets), batch_size):
+            batch = [s or {''} for s in shingle_sets[start:start + batch_size]]
+            lengths = np.fromiter(map(len, batch), dtype=np.int64, count=len(batch))
+            # str hashes are cached on the shingle objects, so this is nearly free
+            hashes = np.fromiter(map(hash, chain.from_iterable(batch)), dtype=np.int64,
+                                 count=int(lengths.sum())).astype(np.uint64) & np.uint64(0xFFFFFFFF)
+            values = (self.a * hashes + self.b) % _MERSENNE
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            result[start:start + len(batch)] = np.minimum.reduceat(values, offsets, axis=1).T
+        return result
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def name_tokens(name):
+    """Words of a mandi name without label prefixes, spellings folded as in addresses"""
+    return frozenset(NAME_LABEL_RE.sub('', normalize_address(name)).split())
+
+
+def _names_compatible(a, b):
+    return a == b or not a or not b
+
+
+def find_near_duplicates(records, threshold=NEAR_DUP_THRESHOLD, bands=BANDS):
+    """Group indexes of records whose addresses are near-duplicates of the same mandi
+
+    `records` is a sequence of dicts (or rows) with district/mandi_name/address.
+    Returns a list of clusters (sorted index lists, first = earliest record).
+    Names only have to agree once labels are stripped (see `name_tokens`):
+
+    >>> find_near_duplicates([
+    ...     {'district': 'Rajkot', 'mandi_name': 'Mandi Name APMC Rajkot', 'address': 'Market Yard, Rajkot 360003'},
+    ...     {'district': 'Rajkot', 'mandi_name': 'APMC Rajkot', 'address': 'Market-Yard, Rajkot - 360003'},
+    ...     {'district': 'Rajkot', 'mandi_name': 'APMC Gondal', 'address': 'Market Yard, Rajkot 360003'}])
+    [[0, 1]]
+    """
+    hasher = MinHasher()
+    rows_per_band = len(hasher.a) // bands
+    parent = list(range(len(records)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    shingle_sets = [shingles(record['address']) for record in records]
+    names = [name_tokens(record['mandi_name']) for record in records]
+    blocks = pd.factorize(pd.Series(
+        [f"{normalize_text(record['district'])}|{extract_pin(record['address'])}" for record in records],
+        dtype=object))[0]
+    signatures = hasher.signatures(shingle_sets)
+
+    # LSH: records that agree on every row of some band (within a block) are candidates
+    buckets = []
+    for band in range(bands):
+        rows = signatures[:, band * rows_per_band:(band + 1) * rows_per_band]
+        band_key = np.zeros(len(records), dtype=np.uint64)
+        for column in rows.T:
+            band_key = band_key * np.uint64(1000003) ^ column
+        order = np.lexsort((band_key, blocks))
+        block_sorted, band_sorted = blocks[order], band_key[order]
+        starts = np.flatnonzero(np.concatenate((
+            [True], (block_sorted[1:] != block_sorted[:-1]) | (band_sorted[1:] != band_sorted[:-1]), [True])))
+        for first, end in zip(starts[:-1], starts[1:]):
+            if end - first > 1:
+                buckets.append(np.sort(order[first:end]).tolist())
+
+    checked = set()
+    for members in buckets:
+        for pos, i in enumerate(members):
+            for j in members[pos + 1:]:
+                if (i, j) in checked or find(i) == find(j):
+                    continue
+                checked.add((i, j))
+                if (_names_compatible(names[i], names[j]) and
+                        jaccard(shingle_sets[i], shingle_sets[j]) >= threshold):
+                    parent[max(find(i), find(j))] = min(find(i), find(j))
+
+    clusters = {}
+    for i in range(len(records)):
+        clusters.setdefault(find(i), []).append(i)
+    return [members for members in clusters.values() if len(members) > 1]
+
+
+def collapse_near_duplicates(df, threshold=NEAR_DUP_THRESHOLD):
+    """Keep the first record of every near-duplicate cluster"""
+    if len(df) < 2:
+        return df
+    records = df[['district', 'mandi_name', 'address']].astype(str).to_dict('records')
+    drop = [df.index[i] for cluster in find_near_duplicates(records, threshold) for i in cluster[1:]]
+    if drop:
+        print(f"After near-duplicate filter: {len(df) - len(drop)} records ({len(drop)} address variants)")
+    return df.drop(index=drop).reset_index(drop=True)
@@ -0,0 +1,409 @@
+"""Direct backend-endpoint engine.
+
+The state -> district -> mandi cascade on the contact page is backed by XHR
+calls. `discover_endpoints` drives Chrome through the cascade once with the
+performance log enabled, records the request/response pairs behind each level
+and turns them into templates. `DirectEnamClient` then replays those templates
+with a pooled keep-alive HTTP session, so each mandi costs one small HTTP round
+trip instead of a browser render.
+"""
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from html import unescape
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import Select
+
+from enam_scraper.orchestrator import DEFAULT_RATE, TokenBucket
+from enam_scraper.parallel import MAX_WORKERS_PER_HOST
+from enam_scraper.records import MandiRecord
+from enam_scraper.scraper import ENAM_URL, FocusedEnamScraper, save_records
+
+PLACEHOLDERS = {'state': '{state}', 'district': '{district}', 'mandi': '{mandi}'}
+PLACEHOLDER_LEVELS = {placeholder: level for level, placeholder in PLACEHOLDERS.items()}
+# Types of templated JSON fields, so an id recorded as 12 is sent back as a number
+JSON_TYPES = {'int': int, 'float': float}
+# Words in a parameter name that tie it to a cascade level
+LEVEL_KEYS = {'state': ('state',), 'district': ('district', 'dist'), 'mandi': ('mandi', 'apmc', 'market')}
+
+OPTION_RE = re.compile(r'<option[^>]*value\s*=\s*["\']([^"\']*)["\'][^>]*>(.*?)</option>',
+                       re.IGNORECASE | re.DOTALL)
+TAG_RE = re.compile(r'<[^>]+>')
+
+
+# --- Discovery -------------------------------------------------------------
+
+def _drain_xhr(driver):
+    """Return XHR/fetch request-response pairs logged since the last call"""
+    pairs = []
+    for entry in driver.get_log('performance'):
+        message = json.loads(entry['message'])['message']
+        if message.get('method') != 'Network.requestWillBeSent':
+            continue
+        params = message['params']
+        if params.get('type') not in ('XHR', 'Fetch'):
+            continue
+        request = params['request']
+        try:
+            body = driver.execute_cdp_cmd('Network.getResponseBody',
+                                          {'requestId': params['requestId']})['body']
+        except Exception:
+            body = ''
+        pairs.append({
+            'method': request['method'],
+            'url': request['url'],
+            'body': request.get('postData', ''),
+            'headers': {k: v for k, v in request.get('headers', {}).items()
+                        if k.lower() in ('content-type', 'x-requested-with', 'accept')},
+            'response': body,
+        })
+    return pairs
+
+
+def _selected_value(driver, index):
+    dropdowns = driver.find_elements(By.CSS_SELECTOR, "select")
+    return Select(dropdowns[index]).first_selected_option.get_attribute('value')
+
+
+def _pick(pairs, marker):
+    """Choose the XHR whose response mentions `marker` (falls back to the largest)"""
+    if not pairs:
+        return None
+    for pair in pairs:
+        if marker and marker in pair['response']:
+            return pair
+    return max(pairs, key=lambda pair: len(pair['response']))
+
+
+def _param_levels(params, values):
+    """Position of each (key, value) param -> the level whose selected value it carries
+
+    A param is tied to a level by its name first ("stateId" -> state), then by
+    value in cascade order, each level and param used once. So a state and a
+    district that share an id still land in their own params.
+    """
+    levels = {}
+    for level, value in values.items():
+        for i, (key, param_value) in enumerate(params):
+            if (i not in levels and param_value == value and
+                    any(word in str(key).lower() for word in LEVEL_KEYS[level])):
+                levels[i] = level
+                break
+    for level, value in values.items():
+        if not value or level in levels.values():
+            continue
+        for i, (_, param_value) in enumerate(params):
+            if i not in levels and param_value == value:
+                levels[i] = level
+                break
+    return levels
+
+
+def _templatize_params(params, values):
+    levels = _param_levels(params, values)
+    return [(key, PLACEHOLDERS[levels[i]] if i in levels else value)
+            for i, (key, value) in enumerate(params)]
+
+
+def templatize(pair, values):
+    """Replace the selected option values in a request with placeholders"""
+    values = {name: value for name, value in values.items() if value}
+    parts = urlsplit(pair['url'])
+    query = urlencode(_templatize_params(parse_qsl(parts.query, keep_blank_values=True), values),
+                      safe='{}')
+    body = pair['body'] or ''
+    json_types = None
+    try:
+        payload = json.loads(body)
+        if isinstance(payload, dict):
+            # Ids may be JSON numbers: compare their text, remember their type
+            items = [(k, str(v) if isinstance(v, (str, int, float)) and not isinstance(v, bool) else None)
+                     for k, v in payload.items()]
+            levels = _param_levels(items, values)
+            keys = list(payload)
+            json_types = {keys[i]: type(payload[keys[i]]).__name__ for i in levels}
+            body = json.dumps({k: PLACEHOLDERS[levels[i]] if i in levels else v
+                               for i, (k, v) in enumerate(payload.items())})
+    except ValueError:
+        if body:
+            body = urlencode(_templatize_params(parse_qsl(body, keep_blank_values=True), values),
+                             safe='{}')
+    template = {
+        'method': pair['method'],
+        'url': urlunsplit(parts._replace(query=query)),
+        'body': body,
+        'headers': pair['headers'],
+    }
+    if json_types is not None:
+        template['json_types'] = json_types
+    return template
+
+
+def _typed(value, type_name):
+    """An option value as the JSON type the field was recorded with"""
+    try:
+        return JSON_TYPES[type_name](value)
+    except (KeyError, ValueError):
+        return str(value)
+
+
+def fill_json(body, json_types, values):
+    """A JSON template body with its placeholder fields set to `values`, re-serialized"""
+    payload = json.loads(body)
+    for key, field in payload.items():
+        level = PLACEHOLDER_LEVELS.get(field) if isinstance(field, str) else None
+        if level in values:
+            payload[key] = _typed(values[level], json_types.get(key))
+    return json.dumps(payload)
+
+
+def discover_endpoints(state="Gujarat", output_path="enam_endpoints.json", base_url=ENAM_URL):
+    """Walk the cascade once in Chrome and save endpoint templates + recorded pairs"""
+    scraper = FocusedEnamScraper(performance_log=True, base_url=base_url)
+    driver = scraper.driver
+    try:
+        if not scraper.open_state(state):
+            return None
+        state_pairs = _drain_xhr(driver)
+        districts = scraper.get_available_districts()
+        if not districts:
+            return None
+
+        dropdowns = driver.find_elements(By.CSS_SELECTOR, "select")
+        states = [(opt.get_attribute('value'), opt.text.strip())
+                  for opt in Select(dropdowns[1]).options if opt.get_attribute('value')]
+        values = {'state': _selected_value(driver, 1)}
+
+        # The details endpoint needs a mandi: use the first district that lists one
+        for district in districts:
+            before = scraper.waits.snapshot()
+            Select(driver.find_elements(By.CSS_SELECTOR, "select")[2]).select_by_visible_text(district)
+            scraper.waits.wait_after_select('district', before)
+            district_pairs = _drain_xhr(driver)
+            dropdowns = driver.find_elements(By.CSS_SELECTOR, "select")
+            mandi_options = [opt for opt in Select(dropdowns[3]).options
+                             if opt.get_attribute('value') and
+                             not opt.text.strip().lower().startswith('select')] if len(dropdowns) > 3 else []
+            if mandi_options:
+                break
+            print(f"  ! No mandis listed for {district}, trying the next district")
+        else:
+            print(f"✗ No district of {state} lists any mandis; cannot record the details endpoint")
+            return None
+        values['district'] = _selected_value(driver, 2)
+
+        first_mandi = mandi_options[0].text.strip()
+        before = scraper.waits.snapshot()
+        Select(dropdowns[3]).select_by_value(mandi_options[0].get_attribute('value'))
+        scraper.waits.wait_after_select('mandi', before)
+        detail_pairs = _drain_xhr(driver)
+        values['mandi'] = _selected_value(driver, 3)
+
+        recorded = {
+            'districts': _pick(state_pairs, districts[0]),
+            'mandis': _pick(district_pairs, first_mandi),
+            'details': _pick(detail_pairs, None),
+        }
+        missing = [level for level, pair in recorded.items() if pair is None]
+        if missing:
+            print(f"✗ Could not find XHR endpoints for: {', '.join(missing)}")
+            return None
+
+        endpoint_map = {
+            'states': states,
+            'templates': {level: templatize(pair, values) for level, pair in recorded.items()},
+            'recorded': [pair for pairs in (state_pairs, district_pairs, detail_pairs)
+                         for pair in pairs],
+        }
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(endpoint_map, f, indent=2)
+        print(f"✓ Saved {len(endpoint_map['recorded'])} recorded XHR pairs to {output_path}")
+        return endpoint_map
+    finally:
+        scraper.close()
+
+
+# --- Response parsing ------------------------------------------------------
+
+def _first_list(payload):
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict):
+        for value in payload.values():
+            found = _first_list(value)
+            if found:
+                return found
+    return []
+
+
+def parse_options(text):
+    """Parse a dropdown response (JSON list or <option> HTML) into (value, label) pairs"""
+    try:
+        items = _first_list(json.loads(text))
+    except ValueError:
+        return [(value, unescape(TAG_RE.sub('', label)).strip())
+                for value, label in OPTION_RE.findall(text)
+                if value and not label.strip().lower().startswith('select')]
+
+    options = []
+    for item in items:
+        if isinstance(item, dict):
+            keys = list(item)
+            value_key = next((k for k in keys if k.lower() in ('id', 'value', 'code')),
+                             next((k for k in keys if 'id' in k.lower()), keys[0]))
+            label_key = next((k for k in keys if 'name' in k.lower()), value_key)
+            options.append((str(item[value_key]), str(item[label_key]).strip()))
+        else:
+            options.append((str(item), str(item).strip()))
+    return options
+
+
+def _field_for(key):
+    key = key.lower()
+    if 'address' in key:
+        return 'address'
+    if any(word in key for word in ('contact', 'phone', 'mobile', 'email', 'tel')):
+        return 'contact_details'
+    if 'name' in key and any(word in key for word in ('mandi', 'apmc', 'market')):
+        return 'mandi_name'
+    return None
+
+
+def parse_details(text, state, district, mandi):
+    """Turn a details response into contact records"""
+    try:
+        payload = json.loads(text)
+        items = _first_list(payload) or [payload]
+    except ValueError:
+        items = [dict(line.split(':', 1) for line in
+                      unescape(TAG_RE.sub('\n', text)).split('\n') if ':' in line)]
+
+    records = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        record = MandiRecord(state, district, mandi)
+        contacts = []
+        for key, value in item.items():
+            field = _field_for(str(key))
+            value = '' if value is None else str(value).strip()
+            if field == 'contact_details':
+                if value:
+                    contacts.append(value)
+            elif field:
+                record[field] = value
+        record['contact_details'] = ', '.join(contacts)
+        if record['address'] and (record['mandi_name'] or record['contact_details']):
+            records.append(record)
+    return records
+
+
+# --- Replay ----------------------------------------------------------------
+
+class DirectEnamClient:
+    def __init__(self, endpoint_map, base_url=None, max_connections=MAX_WORKERS_PER_HOST, rate=DEFAULT_RATE,
+                 timeout=15):
+        if max_connections > MAX_WORKERS_PER_HOST:
+            print(f"! Limiting connections to {MAX_WORKERS_PER_HOST} (per-host politeness cap)")
+            max_connections = MAX_WORKERS_PER_HOST
+        self.states = {label: value for value, label in endpoint_map['states']}
+        self.templates = endpoint_map['templates']
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.bucket = TokenBucket(rate)  # Shared by every pooled thread
+
+        # One keep-alive session with a pool sized for our concurrency
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f), **kwargs)
+
+    def request(self, level, **values):
+        """Fill in a template and return the response text"""
+        template = self.templates[level]
+        url, body = template['url'], template['body']
+        json_body = 'json_types' in template or body.startswith('{')
+        for name, value in values.items():
+            url = url.replace(PLACEHOLDERS[name], quote(str(value), safe=''))
+            if not json_body:
+                body = body.replace(PLACEHOLDERS[name], quote(str(value), safe=''))
+        if json_body:
+            body = fill_json(body, template.get('json_types', {}), values)
+        if self.base_url:
+            base = urlsplit(self.base_url)
+            url = urlunsplit(urlsplit(url)._replace(scheme=base.scheme, netloc=base.netloc))
+        self.bucket.acquire()
+        response = self.session.request(template['method'], url, data=body or None,
+                                        headers=template['headers'], timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def districts(self, state_value):
+        return parse_options(self.request('districts', state=state_value))
+
+    def mandis(self, state_value, district_value):
+        return parse_options(self.request('mandis', state=state_value, district=district_value))
+
+    def details(self, state, district, mandi):
+        """state/district/mandi are (value, label) pairs"""
+        text = self.request('details', state=state[0], district=district[0], mandi=mandi[0])
+        return parse_details(text, state[1], district[1], mandi[1])
+
+    def scrape_state(self, state, max_districts=None):
+        """Return raw records for every mandi of a state"""
+        if state not in self.states:
+            print(f"✗ State '{state}' not found in endpoint map")
+            return []
+        state_pair = (self.states[state], state)
+        districts = self.districts(state_pair[0])
+        if max_districts is not None:
+            districts = districts[:max_districts]
+        print(f"Found {len(districts)} districts")
+
+        with ThreadPoolExecutor(max_workers=self.max_connections) as pool:
+            mandi_lists = list(pool.map(lambda d: self._safe_mandis(state_pair, d), districts))
+            units = [(district, mandi) for district, mandis in zip(districts, mandi_lists)
+                     for mandi in mandis]
+            print(f"Fetching details for {len(units)} mandis...")
+            results = pool.map(lambda unit: self._safe_details(state_pair, *unit), units)
+            return [record for records in results for record in records]
+
+    def _safe_mandis(self, state, district):
+        try:
+            return self.mandis(state[0], district[0])
+        except requests.RequestException as e:
+            print(f"  ✗ Error listing mandis of {district[1]}: {e}")
+            return []
+
+    def _safe_details(self, state, district, mandi):
+        try:
+            return self.details(state, district, mandi)
+        except requests.RequestException as e:
+            print(f"  ✗ Error fetching {mandi[1]}: {e}")
+            return []
+
+
+def run_direct_scraper(state="Gujarat", endpoints_path="enam_endpoints.json",
+                       max_districts=None, base_url=None, max_connections=MAX_WORKERS_PER_HOST, rate=None):
+    """Scrape a state by replaying the discovered backend endpoints"""
+    rate = rate or DEFAULT_RATE
+    try:
+        client = DirectEnamClient.from_file(endpoints_path, base_url=base_url,
+                                            max_connections=max_connections, rate=rate)
+    except FileNotFoundError:
+        print(f"No endpoint map at {endpoints_path}, discovering with Chrome...")
+        if discover_endpoints(state, endpoints_path, base_url or ENAM_URL) is None:
+            return None
+        client = DirectEnamClient.from_file(endpoints_path, base_url=base_url,
+                                            max_connections=max_connections, rate=rate)
+    return save_records(client.scrape_state(state, max_districts))
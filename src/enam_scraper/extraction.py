@@ -0,0 +1,212 @@
+"""Extraction engine that works on an HTML snapshot instead of live WebDriver elements.
+
+The scraper grabs `driver.page_source` once per page and runs the table, text
+and element strategies over the parsed tree in-process. Everything here also
+works on a raw HTML string with no browser, e.g.
+
+    records = extract_records(html, "Gujarat", "Rajkot")
+"""
+from bs4 import BeautifulSoup, Comment, NavigableString
+
+from enam_scraper.addresses import extract_pin
+from enam_scraper.contacts import CONTACT_LINE_RE
+from enam_scraper.records import MandiRecord
+
+try:
+    import lxml  # noqa: F401
+    PARSER = 'lxml'
+except ImportError:
+    PARSER = 'html.parser'
+
+TABLE_KEYWORDS = ['mandi', 'contact', 'address', 'apmc']
+PAGE_KEYWORDS = ['contact details', 'mandi name', 'apmc']
+ELEMENT_KEYWORDS = ['mandi', 'contact', 'apmc']
+ADDRESS_KEYWORDS = ['address', 'road', 'pin', 'market']
+
+# Common result containers on the contact page
+ELEMENT_SELECTORS = [
+    '.result', '.contact-details', '.mandi-details',
+    '.table-responsive', '.search-result', '.data-row',
+    '[class*="result"]', '[class*="contact"]', '[class*="mandi"]'
+]
+
+# Tags that start a new line in rendered text (like WebElement.text)
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'body', 'caption', 'dd', 'div', 'dl',
+    'dt', 'fieldset', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table',
+    'tbody', 'thead', 'tfoot', 'tr', 'ul',
+}
+SKIP_TAGS = {'head', 'script', 'style', 'noscript', 'template', 'select', 'option'}
+
+
+def parse_html(html):
+    """Parse a page snapshot (lxml when available)"""
+    return BeautifulSoup(html, PARSER)
+
+
+def _is_hidden(tag):
+    style = (tag.get('style') or '').replace(' ', '').lower()
+    return tag.has_attr('hidden') or 'display:none' in style
+
+
+def _render(node, out):
+    for child in node.children:
+        if isinstance(child, NavigableString):
+            if not isinstance(child, Comment):
+                out.append(' '.join(child.split()) if child.strip() else ' ')
+            continue
+        name = child.name
+        if name in SKIP_TAGS or _is_hidden(child):
+            continue
+        if name == 'br':
+            out.append('\n')
+        elif name in BLOCK_TAGS:
+            out.append('\n')
+            _render(child, out)
+            out.append('\n')
+        elif name in ('td', 'th'):
+            _render(child, out)
+            out.append(' ')
+        else:
+            _render(child, out)
+
+
+def element_text(node):
+    """Approximate Selenium's rendered `.text` for a parsed element"""
+    out = []
+    _render(node, out)
+    lines = (' '.join(line.split()) for line in ''.join(out).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def _new_record(state, district, mandi):
+    return MandiRecord(state, district, mandi or '')
+
+
+def extract_from_tables(soup, state, district, mandi=None):
+    """Extract records from label/value HTML tables"""
+    records = []
+    for table in soup.find_all('table'):
+        rows = table.find_all('tr')
+        if len(rows) < 2:
+            continue
+
+        # Check if this table contains contact details
+        table_text = element_text(table).lower()
+        if not any(keyword in table_text for keyword in TABLE_KEYWORDS):
+            continue
+
+        record = _new_record(state, district, mandi)
+        for row in rows:
+            cells = row.find_all(['td', 'th'])
+            if len(cells) >= 2:
+                key = element_text(cells[0]).strip().lower()
+                value = element_text(cells[1]).strip()
+
+                if 'mandi' in key and 'name' in key:
+                    record['mandi_name'] = value
+                elif 'address' in key:
+                    record['address'] = value
+                elif 'contact' in key:
+                    record['contact_details'] = value
+                elif 'state' in key and not record['state']:
+                    record['state'] = value
+
+        # Only keep if we found meaningful data AND address is not empty
+        if (record['mandi_name'] or record['contact_details']) and record['address'].strip():
+            records.append(record)
+    return records
+
+
+def extract_from_page_text(page_text, state, district, mandi=None):
+    """Extract a record from the rendered page text"""
+    if not any(keyword in page_text.lower() for keyword in PAGE_KEYWORDS):
+        return []
+
+    record = None
+    for line in page_text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+
+        lowered = line.lower()
+        if 'mandi name' in lowered and ':' in line:
+            if not record:
+                record = _new_record(state, district, mandi)
+            record['mandi_name'] = line.split(':', 1)[1].strip()
+        elif record and 'address' in lowered and ':' in line:
+            record['address'] = line.split(':', 1)[1].strip()
+        elif record and 'contact' in lowered and ':' in line:
+            record['contact_details'] = line.split(':', 1)[1].strip()
+
+    if record and record['address'].strip() and (record['mandi_name'] or record['contact_details']):
+        return [record]
+    return []
+
+
+def extract_from_elements(soup, state, district, mandi=None):
+    """Extract records from common result containers"""
+    records = []
+    for selector in ELEMENT_SELECTORS:
+        for element in soup.select(selector):
+            element_str = element_text(element)
+            lowered = element_str.lower()
+            if len(element_str) <= 20 or not any(keyword in lowered for keyword in ELEMENT_KEYWORDS):
+                continue
+
+            # Only extract if we can find address information
+            if any(keyword in lowered for keyword in ADDRESS_KEYWORDS):
+                record = MandiRecord(state, district,
+                                     mandi or extract_mandi_name_from_text(element_str),
+                                     extract_address_from_text(element_str),
+                                     extract_contact_from_text(element_str))
+                if record.address.strip():
+                    records.append(record)
+                    break  # Only take first valid match per selector
+    return records
+
+
+def extract_records(html, state, district, mandi=None):
+    """Run all three strategies over one HTML snapshot"""
+    soup = parse_html(html)
+    body = soup.body or soup
+    return (extract_from_tables(soup, state, district, mandi) +
+            extract_from_page_text(element_text(body), state, district, mandi) +
+            extract_from_elements(soup, state, district, mandi))
+
+
+def extract_mandi_name_from_text(text):
+    """Extract mandi name from text"""
+    for line in text.split('\n'):
+        if 'mandi name' in line.lower() and ':' in line:
+            return line.split(':', 1)[1].strip()
+        elif 'apmc' in line.lower() and len(line) < 100:
+            return line.strip()
+    return ''
+
+
+def extract_address_from_text(text):
+    """Extract address from text: the labeled line, else a keyword line (preferring one with a valid PIN)"""
+    with_pin = fallback = ''
+    for line in text.split('\n'):
+        if 'address' in line.lower() and ':' in line:
+            return line.split(':', 1)[1].strip()
+        elif any(keyword in line.lower() for keyword in ['road', 'pin', 'market', 'commiti']) and len(line) > 20:
+            if not with_pin and extract_pin(line):
+                with_pin = line.strip()
+            fallback = fallback or line.strip()
+    return with_pin or fallback
+
+
+def extract_contact_from_text(text):
+    """Extract contact details from text"""
+    contact_info = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if 'contact' in line.lower() and ':' in line:
+            contact_info.append(line.split(':', 1)[1].strip())
+        elif len(line) < 50 and CONTACT_LINE_RE.search(line):
+            # Short lines with an email, phone or fax number
+            contact_info.append(line)
+    return ', '.join(contact_info)
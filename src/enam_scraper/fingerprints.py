@@ -0,0 +1,164 @@
+"""Per-mandi content fingerprints for incremental (delta) scraping.
+
+For every page the scraper extracts from we keep a hash of its rendered text
+together with the records it produced. When the next run sees the same hash
+the stored records are reused and extraction is skipped. After cleaning, the
+new snapshot is compared with the previous one and only the added, removed and
+changed mandis are written to `enam_delta_{epoch}.csv`.
+"""
+import hashlib
+import json
+import sqlite3
+import time
+
+import pandas as pd
+
+from enam_scraper.records import MandiRecord
+
+DEFAULT_FINGERPRINTS = 'enam_fingerprints.sqlite'
+KEY_FIELDS = ['state', 'district', 'mandi_name']
+VALUE_FIELDS = ['address', 'contact_details']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    state TEXT NOT NULL,
+    district TEXT NOT NULL,
+    mandi TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    records TEXT NOT NULL,
+    updated_at REAL,
+    PRIMARY KEY (state, district, mandi)
+);
+CREATE TABLE IF NOT EXISTS snapshot (
+    state TEXT,
+    district TEXT,
+    mandi_name TEXT,
+    address TEXT,
+    contact_details TEXT
+);
+CREATE INDEX IF NOT EXISTS snapshot_scope ON snapshot (state, district);
+"""
+
+
+def page_fingerprint(page_text):
+    """Hash of a page's rendered text"""
+    return hashlib.sha256(page_text.encode('utf-8')).hexdigest()
+
+
+class FingerprintStore:
+    def __init__(self, path=DEFAULT_FINGERPRINTS):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.reused = 0
+
+    def close(self):
+        self.conn.close()
+
+    def lookup(self, state, district, mandi, digest):
+        """Records stored for this page if its hash is unchanged, else None"""
+        row = self.conn.execute(
+            "SELECT hash, records FROM pages WHERE state = ? AND district = ? AND mandi = ?",
+            (state, district, mandi or '')).fetchone()
+        if row is None or row[0] != digest:
+            return None
+        with self.conn:
+            # Keeps the page inside this run's delta scope
+            self.conn.execute(
+                "UPDATE pages SET updated_at = ? WHERE state = ? AND district = ? AND mandi = ?",
+                (time.time(), state, district, mandi or ''))
+        self.reused += 1
+        return [MandiRecord.from_mapping(record) for record in json.loads(row[1])]
+
+    def update(self, state, district, mandi, digest, records):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (state, district, mandi, hash, records, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (state, district, mandi or '', digest, json.dumps([dict(record) for record in records]), time.time()))
+
+    def snapshot(self, scope):
+        """Previous clean records for the given (state, district) pairs"""
+        states = sorted({state for state, _ in scope})
+        if not states:
+            return pd.DataFrame(columns=KEY_FIELDS + VALUE_FIELDS)
+        placeholders = ', '.join('?' * len(states))
+        df = pd.read_sql_query(
+            f"SELECT {', '.join(KEY_FIELDS + VALUE_FIELDS)} FROM snapshot WHERE state IN ({placeholders})",
+            self.conn, params=states)
+        return in_scope(df, scope)
+
+    def replace_snapshot(self, scope, df):
+        """Store the in-scope clean records of this run as the baseline for the next one"""
+        df = in_scope(df, scope)
+        with self.conn:
+            self.conn.executemany("DELETE FROM snapshot WHERE state = ? AND district = ?", sorted(scope))
+            rows = df[KEY_FIELDS + VALUE_FIELDS].astype(str).itertuples(index=False, name=None)
+            self.conn.executemany("INSERT INTO snapshot VALUES (?, ?, ?, ?, ?)", rows)
+
+    def scope(self, since):
+        """(state, district) pairs whose pages were fingerprinted since `since`"""
+        rows = self.conn.execute(
+            "SELECT DISTINCT state, district FROM pages WHERE updated_at >= ?", (since,)).fetchall()
+        return set(rows)
+
+
+def in_scope(df, scope):
+    """Rows of `df` whose (state, district) is in `scope`"""
+    if len(df) == 0:
+        return df
+    return df[pd.MultiIndex.from_frame(df[['state', 'district']].astype(str)).isin(list(scope))]
+
+
+def compute_delta(previous, current):
+    """Added, removed and changed mandis between two clean snapshots
+
+    A mandi listed more than once counts with its last row, the most recently
+    written one (as in `cli merge`), so a stale copy ahead of it can't hide a change:
+
+    >>> columns = KEY_FIELDS + VALUE_FIELDS
+    >>> previous = pd.DataFrame([['Gujarat', 'Rajkot', 'APMC Rajkot', 'Old Market Yard', '0281-2222']],
+    ...                         columns=columns)
+    >>> current = pd.concat([previous, previous.assign(address='New Market Yard')])
+    >>> compute_delta(previous, current)[['change', 'address', 'address_old']].values.tolist()
+    [['changed', 'New Market Yard', 'Old Market Yard']]
+    """
+    previous = previous[KEY_FIELDS + VALUE_FIELDS].astype(str).drop_duplicates(KEY_FIELDS, keep='last')
+    current = current[KEY_FIELDS + VALUE_FIELDS].astype(str).drop_duplicates(KEY_FIELDS, keep='last')
+    merged = previous.merge(current, on=KEY_FIELDS, how='outer', suffixes=('_old', ''), indicator=True)
+
+    changed = (merged['_merge'] == 'both') & (
+        (merged['address'] != merged['address_old']) |
+        (merged['contact_details'] != merged['contact_details_old']))
+    merged['change'] = None
+    merged.loc[merged['_merge'] == 'right_only', 'change'] = 'added'
+    merged.loc[merged['_merge'] == 'left_only', 'change'] = 'removed'
+    merged.loc[changed, 'change'] = 'changed'
+
+    delta = merged[merged['change'].notna()]
+    columns = ['change'] + KEY_FIELDS + VALUE_FIELDS + [f"{field}_old" for field in VALUE_FIELDS]
+    return delta[columns].reset_index(drop=True)
+
+
+def write_delta(store, df, scope):
+    """Write the delta against the previous run and make `df` the new baseline
+
+    Only districts in `scope` are compared and stored: `df` may hold more
+    (an appended output file, a resumed or multi-state run).
+    """
+    if df is None:
+        df = pd.DataFrame(columns=KEY_FIELDS + VALUE_FIELDS)
+    df = in_scope(df, scope)
+    delta = compute_delta(store.snapshot(scope), df)
+    store.replace_snapshot(scope, df)
+
+    if len(delta) == 0:
+        print("✓ No changes since the previous run")
+        return delta
+    filename = f"enam_delta_{int(time.time())}.csv"
+    delta.to_csv(filename, index=False)
+    counts = delta['change'].value_counts()
+    print(f"✓ Saved delta to {filename}: {counts.get('added', 0)} added, "
+          f"{counts.get('removed', 0)} removed, {counts.get('changed', 0)} changed")
+    return delta
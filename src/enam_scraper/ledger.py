@@ -0,0 +1,165 @@
+"""Persistent work ledger for resumable scraping.
+
+Tracks every (state, district, mandi) unit as pending, done or failed in
+SQLite and commits each unit's records as soon as they are extracted. A
+district-level unit uses mandi = ''. A `--resume` run skips done units and
+retries failed ones with exponential backoff.
+"""
+import os
+import sqlite3
+import time
+
+from enam_scraper.records import FIELDS, MandiRecord
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+DEFAULT_LEDGER = 'enam_ledger.sqlite'
+RECORD_FIELDS = list(FIELDS)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    state TEXT NOT NULL,
+    district TEXT NOT NULL,
+    mandi TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    updated_at REAL,
+    PRIMARY KEY (state, district, mandi)
+);
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    unit_state TEXT NOT NULL,
+    unit_district TEXT NOT NULL,
+    unit_mandi TEXT NOT NULL,
+    state TEXT,
+    district TEXT,
+    mandi_name TEXT,
+    address TEXT,
+    contact_details TEXT
+);
+CREATE INDEX IF NOT EXISTS records_unit ON records (unit_state, unit_district, unit_mandi);
+"""
+
+
+class WorkLedger:
+    def __init__(self, path=DEFAULT_LEDGER, max_attempts=3, backoff_base=5, backoff_max=300):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # Long busy timeout so several worker processes can share one ledger
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def add_units(self, state, district=None, names=()):
+        """Register districts (district=None) or mandis of a district as pending"""
+        rows = [(state, name, '') for name in names] if district is None else \
+            [(state, district, name) for name in names]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO units (state, district, mandi, updated_at) VALUES (?, ?, ?, ?)",
+                [row + (time.time(),) for row in rows])
+
+    def reset(self, state):
+        """Forget all units and records of a state (fresh, non-resumed run)"""
+        with self.conn:
+            self.conn.execute("DELETE FROM units WHERE state = ?", (state,))
+            self.conn.execute("DELETE FROM records WHERE unit_state = ?", (state,))
+
+    def status(self, state, district, mandi=''):
+        row = self.conn.execute(
+            "SELECT status FROM units WHERE state = ? AND district = ? AND mandi = ?",
+            (state, district, mandi)).fetchone()
+        return row[0] if row else None
+
+    def is_done(self, state, district, mandi=''):
+        return self.status(state, district, mandi) == DONE
+
+    def district_done(self, state, district):
+        """True when the district unit and all of its mandi units are done"""
+        row = self.conn.execute(
+            "SELECT COUNT(*), SUM(status = 'done') FROM units WHERE state = ? AND district = ?",
+            (state, district)).fetchone()
+        return bool(row[0]) and row[0] == row[1] and self.is_done(state, district)
+
+    def complete(self, state, district, mandi, records):
+        """Atomically store a unit's records and mark it done"""
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM records WHERE unit_state = ? AND unit_district = ? AND unit_mandi = ?",
+                (state, district, mandi))
+            self.conn.executemany(
+                "INSERT INTO records (unit_state, unit_district, unit_mandi, state, district, "
+                "mandi_name, address, contact_details) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(state, district, mandi) + tuple(record.get(field, '') for field in RECORD_FIELDS)
+                 for record in records])
+            self._set_status(state, district, mandi, DONE, None)
+
+    def fail(self, state, district, mandi, error):
+        with self.conn:
+            self._set_status(state, district, mandi, FAILED, str(error)[:500], attempt=True)
+
+    def _set_status(self, state, district, mandi, status, error, attempt=False):
+        self.conn.execute(
+            "INSERT INTO units (state, district, mandi, status, attempts, last_error, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (state, district, mandi) DO UPDATE SET status = excluded.status, "
+            "attempts = attempts + ?, last_error = excluded.last_error, updated_at = excluded.updated_at",
+            (state, district, mandi, status, int(attempt), error, time.time(), int(attempt)))
+
+    def retryable_districts(self, state):
+        """Districts with failed units that still have attempts left"""
+        rows = self.conn.execute(
+            "SELECT DISTINCT district FROM units WHERE state = ? AND status = 'failed' AND attempts < ?",
+            (state, self.max_attempts)).fetchall()
+        return [row[0] for row in rows]
+
+    def mandi_counts(self, state):
+        """Mandis seen per district in earlier runs (an estimate of each district's size)"""
+        rows = self.conn.execute(
+            "SELECT district, COUNT(*) FROM units WHERE state = ? AND mandi != '' GROUP BY district",
+            (state,)).fetchall()
+        return dict(rows)
+
+    def backoff_delay(self, attempt):
+        """Exponential backoff for the given retry round (1-based)"""
+        return min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+
+    def iter_records(self, state=None):
+        """Stream committed records, optionally for one state"""
+        query = "SELECT state, district, mandi_name, address, contact_details FROM records"
+        params = ()
+        if state is not None:
+            query += " WHERE unit_state = ?"
+            params = (state,)
+        query += " ORDER BY id"
+        for row in self.conn.execute(query, params):
+            yield MandiRecord(*row)
+
+    def records(self, state=None):
+        """All committed records, optionally for one state"""
+        return list(self.iter_records(state))
+
+    def summary(self, state):
+        rows = self.conn.execute(
+            "SELECT status, COUNT(*) FROM units WHERE state = ? GROUP BY status", (state,)).fetchall()
+        return dict(rows)
+
+
+def estimated_sizes(state, path=None):
+    """Mandi counts per district from an earlier run's ledger, if there is one"""
+    path = path or DEFAULT_LEDGER
+    if not os.path.exists(path):
+        return {}
+    ledger = WorkLedger(path)
+    try:
+        return ledger.mandi_counts(state)
+    finally:
+        ledger.close()
@@ -0,0 +1,181 @@
+"""Per-stage timings and counters for scrape runs.
+
+Every navigation, wait and extraction stage is timed as a span, records are
+counted as they are extracted, rejected or de-duplicated, and every WebDriver
+command is counted and timed. Spans can be streamed as JSON lines while the
+run goes, and the totals are printed as a table and/or written as a
+Prometheus textfile at the end:
+
+    metrics = Metrics(log_path='enam_metrics.jsonl')
+    with metrics.span('select', step='state'):
+        ...
+    metrics.incr('records_extracted', method='table')
+    metrics.write_prometheus('enam.prom')
+
+Time spent is split into `webdriver` (round trips to Chrome), `wait` (the
+portal's XHR cascade settling) and `extract` (our own parsing), so a slow run
+shows where the time went. WebDriver calls made while a wait polls the page
+are already inside `wait`, so they go to their own `webdriver_in_wait` bucket
+and the three phases never add up to more than the wall time.
+"""
+import json
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+PROMETHEUS_PREFIX = 'enam'
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _prom_labels(labels):
+    if not labels:
+        return ''
+    escaped = (v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in labels)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + '}'
+
+
+class Metrics:
+    def __init__(self, log_path=None):
+        self.log_path = log_path
+        self.spans = {}  # (name, labels) -> [count, total seconds, max seconds]
+        self.counters = Counter()  # (name, labels) -> value
+        self._waiting = 0  # Depth of `waiting()` blocks in progress
+        self._log = open(log_path, 'a', encoding='utf-8', buffering=1) if log_path else None
+
+    def close(self):
+        if self._log:
+            self._log.close()
+            self._log = None
+
+    @contextmanager
+    def span(self, name, **labels):
+        """Time the enclosed block as one `name` span"""
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start, error=error, **labels)
+
+    @contextmanager
+    def waiting(self):
+        """Mark WebDriver calls in the enclosed block as part of a wait (see `instrument`)"""
+        self._waiting += 1
+        try:
+            yield
+        finally:
+            self._waiting -= 1
+
+    def observe(self, name, seconds, error=None, **labels):
+        """Record a span measured elsewhere"""
+        self._add(_key(name, labels), seconds)
+        if self._log:
+            event = {'ts': round(time.time(), 3), 'span': name, 'seconds': round(seconds, 4), **labels}
+            if error:
+                event['error'] = error
+            self._log.write(json.dumps(event) + '\n')
+
+    def _add(self, key, seconds):
+        entry = self.spans.setdefault(key, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+
+    def incr(self, name, amount=1, **labels):
+        self.counters[_key(name, labels)] += amount
+
+    def instrument(self, driver):
+        """Count and time every WebDriver command sent by this driver (totals only, not logged)
+
+        Commands sent inside `waiting()` are timed as `webdriver_in_wait`: the
+        enclosing `wait` span already covers them.
+        """
+        execute = driver.execute
+
+        def timed_execute(driver_command, params=None):
+            start = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                name = 'webdriver_in_wait' if self._waiting else 'webdriver'
+                self._add(_key(name, {'command': driver_command}), time.perf_counter() - start)
+                self.counters[_key('webdriver_calls', {})] += 1
+
+        driver.execute = timed_execute
+        return driver
+
+    def snapshot(self):
+        """Plain, picklable copy of the totals (for handing back from worker processes)"""
+        return {'spans': {key: list(entry) for key, entry in self.spans.items()},
+                'counters': dict(self.counters)}
+
+    def merge(self, snapshot):
+        """Add the totals of another Metrics' snapshot"""
+        for key, (count, total, longest) in snapshot['spans'].items():
+            entry = self.spans.setdefault(key, [0, 0.0, 0.0])
+            entry[0] += count
+            entry[1] += total
+            entry[2] = max(entry[2], longest)
+        self.counters.update(snapshot['counters'])
+
+    def reset(self):
+        self.spans = {}
+        self.counters = Counter()
+
+    def totals(self, name):
+        """(count, seconds) over every label set of a span"""
+        entries = [entry for (span, _), entry in self.spans.items() if span == name]
+        return sum(entry[0] for entry in entries), sum(entry[1] for entry in entries)
+
+    def count(self, name):
+        return sum(value for (counter, _), value in self.counters.items() if counter == name)
+
+    def print_summary(self):
+        """Print a table of stage timings and counters"""
+        if not self.spans and not self.counters:
+            return
+        print("\nRun metrics:")
+        print(f"  {'stage':<40} {'count':>7} {'total s':>9} {'mean s':>8} {'max s':>8}")
+        for (name, labels), (count, total, longest) in sorted(self.spans.items(),
+                                                                key=lambda item: -item[1][1]):
+            label = name + ''.join(f" {k}={v}" for k, v in labels)
+            print(f"  {label[:40]:<40} {count:>7} {total:>9.2f} {total / count:>8.3f} {longest:>8.2f}")
+        for (name, labels), value in sorted(self.counters.items()):
+            label = name + ''.join(f" {k}={v}" for k, v in labels)
+            print(f"  {label[:40]:<40} {value:>7}")
+        for name in ('webdriver', 'wait', 'extract'):
+            count, total = self.totals(name)
+            if count:
+                print(f"- {name}: {total:.1f}s over {count} calls")
+        count, total = self.totals('webdriver_in_wait')
+        if count:
+            print(f"  (wait includes {total:.1f}s of WebDriver polling over {count} calls)")
+
+    def write_prometheus(self, path):
+        """Write the totals in the Prometheus textfile-collector format"""
+        lines = [f"# TYPE {PROMETHEUS_PREFIX}_stage_seconds summary"]
+        for (name, labels), (count, total, _) in sorted(self.spans.items()):
+            stage = _prom_labels((('stage', name),) + labels)
+            lines.append(f"{PROMETHEUS_PREFIX}_stage_seconds_sum{stage} {total:.6f}")
+            lines.append(f"{PROMETHEUS_PREFIX}_stage_seconds_count{stage} {count}")
+        names = sorted({name for name, _ in self.counters})
+        for name in names:
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name}_total counter")
+            for (counter, labels), value in sorted(self.counters.items()):
+                if counter == name:
+                    lines.append(f"{PROMETHEUS_PREFIX}_{name}_total{_prom_labels(labels)} {value}")
+        lines.append(f"{PROMETHEUS_PREFIX}_last_run_timestamp_seconds {time.time():.0f}")
+
+        # Write-then-rename so the collector never reads a half-written file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, path)
+        print(f"✓ Wrote metrics to {path}")
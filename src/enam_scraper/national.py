@@ -0,0 +1,134 @@
+"""All-India runs: every state in the dropdown as one job with one output.
+
+The state list is read from the state dropdown and each state's districts
+from the district dropdown, all on one page load. Every (state, district) is
+then a unit for the worker pool, handed out largest-first (longest processing
+time first): the big districts start early and the small ones fill the gaps
+at the end, so workers finish close together. District sizes are the mandi
+counts an earlier run left in the ledger; districts without history get
+their state's average. Records from all states are cleaned and
+de-duplicated once, into a single CSV (or the given sink).
+"""
+import heapq
+import time
+
+from enam_scraper.ledger import DEFAULT_LEDGER, WorkLedger, estimated_sizes
+from enam_scraper.metrics import Metrics
+from enam_scraper.parallel import MAX_WORKERS_PER_HOST, close_scraper, run_units
+from enam_scraper.scraper import ENAM_URL, FocusedEnamScraper, save_incremental, save_records
+
+
+def discover_all(base_url=ENAM_URL, metrics=None, lean=False, states=None):
+    """Open the page once and list the districts of every state (or of `states`)"""
+    scraper = FocusedEnamScraper(base_url=base_url, metrics=metrics, lean=lean)
+    try:
+        scraper.open_page()
+        districts_by_state = {}
+        for state in states or scraper.get_available_states():
+            if scraper.select_state(state):
+                districts_by_state[state] = scraper.get_available_districts()
+        return districts_by_state
+    finally:
+        close_scraper(scraper)
+
+
+def plan_units(districts_by_state, sizes=None, workers=2):
+    """Order (state, district) units largest-first; returns (units, estimated size per unit)
+
+    A single worker gains nothing from the order, so it keeps each state
+    together (largest state first) and saves a page load per state switch.
+    """
+    sizes = sizes or {}
+    estimates = {}
+    for state, districts in districts_by_state.items():
+        known = sizes.get(state, {})
+        default = sum(known.values()) / len(known) if known else 1
+        for district in districts:
+            estimates[state, district] = known.get(district, default)
+
+    units = sorted(estimates, key=lambda unit: (-estimates[unit], -len(districts_by_state[unit[0]])))
+    if workers == 1:
+        state_sizes = {state: sum(estimates[state, district] for district in districts)
+                       for state, districts in districts_by_state.items()}
+        units.sort(key=lambda unit: -state_sizes[unit[0]])  # Stable: still largest-first within a state
+    return units, estimates
+
+
+def estimate_loads(units, estimates, workers):
+    """Estimated mandis per worker when each unit goes to the first worker that is free"""
+    loads = [0] * workers
+    for unit in units:
+        heapq.heapreplace(loads, loads[0] + estimates[unit])
+    return sorted(loads)
+
+
+def run_all_states(max_districts=None, workers=1, archive_dir=None, ledger_path=None, resume=False,
+                   fingerprints_path=None, sink=None, base_url=ENAM_URL, metrics=None, lean=False,
+                   states=None):
+    """Scrape every state (or `states`) as one job; `max_districts` applies per state"""
+    started = time.time()
+    metrics = metrics or Metrics()
+    if workers > MAX_WORKERS_PER_HOST:
+        print(f"! Limiting workers to {MAX_WORKERS_PER_HOST} (per-host politeness cap)")
+        workers = MAX_WORKERS_PER_HOST
+
+    print("Discovering states and districts...")
+    districts_by_state = discover_all(base_url, metrics, lean, states)
+    if max_districts is not None:
+        districts_by_state = {state: districts[:max_districts] for state, districts in districts_by_state.items()}
+    districts_by_state = {state: districts for state, districts in districts_by_state.items() if districts}
+    if not districts_by_state:
+        print("✗ No districts to process")
+        return None
+    print(f"✓ {len(districts_by_state)} states, {sum(map(len, districts_by_state.values()))} districts")
+    sizes = {state: estimated_sizes(state, ledger_path) for state in districts_by_state}
+
+    ledger = None
+    if ledger_path is not None or resume:
+        ledger = WorkLedger(ledger_path or DEFAULT_LEDGER)
+        for state, districts in list(districts_by_state.items()):
+            if resume:
+                print(f"Resuming {state} from {ledger.path}: {ledger.summary(state) or 'no units yet'}")
+                if sink:
+                    # Records committed by earlier, interrupted runs
+                    sink.write_many(ledger.iter_records(state))
+            else:
+                ledger.reset(state)
+            ledger.add_units(state, names=districts)
+            districts_by_state[state] = [district for district in districts
+                                         if not ledger.district_done(state, district)]
+
+    units, estimates = plan_units(districts_by_state, sizes, workers)
+    data = []
+    if units:
+        workers = min(workers, len(units))
+        loads = estimate_loads(units, estimates, workers)
+        print(f"Processing {len(units)} districts largest-first with {workers} workers "
+              f"(estimated mandis per worker: {loads[0]:.0f}-{loads[-1]:.0f})")
+        data = run_units(units, workers, archive_dir, ledger and ledger.path, fingerprints_path,
+                         sink, base_url, metrics, lean)
+
+    if ledger:
+        for attempt in range(1, ledger.max_attempts):
+            retry = {state: ledger.retryable_districts(state) for state in districts_by_state}
+            retry_units, _ = plan_units({state: districts for state, districts in retry.items() if districts},
+                                        sizes, workers)
+            if not retry_units:
+                break
+            delay = ledger.backoff_delay(attempt)
+            print(f"\nRetry round {attempt}: {len(retry_units)} districts with failed units (waiting {delay}s)")
+            time.sleep(delay)
+            run_units(retry_units, min(workers, len(retry_units)), archive_dir, ledger.path, fingerprints_path,
+                      sink, base_url, metrics, lean)
+    if sink:
+        return None
+
+    if ledger:
+        # Includes records committed by earlier, interrupted runs
+        df = save_records([record for state in districts_by_state for record in ledger.iter_records(state)],
+                          metrics)
+    else:
+        df = save_records(data, metrics)
+    if fingerprints_path:
+        save_incremental(df, fingerprints_path, started)
+    return df
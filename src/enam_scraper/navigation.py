@@ -0,0 +1,120 @@
+"""Dropdown navigation that only issues the selections it needs.
+
+The contact page is a cascade of <select> elements (language → state →
+district → mandi). `NavigationPlanner` remembers what it selected in each one
+and, before every move, reads the live selection of all dropdowns with a
+single script call. A level is only re-selected when it differs from the
+target, or when the page reset it behind our back; parents that are still in
+place are left alone. Skipped selections are counted as saved transitions.
+"""
+from contextlib import nullcontext
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import Select
+
+# Dropdown position of each level on the contact page
+LEVELS = ['language', 'state', 'district', 'mandi']
+
+# [value, selected text] of every <select>, in one round trip
+SELECTION_JS = """
+var out = [];
+var selects = document.querySelectorAll('select');
+for (var i = 0; i < selects.length; i++) {
+    var s = selects[i];
+    var option = s.selectedIndex >= 0 ? s.options[s.selectedIndex] : null;
+    out.push([s.value, option ? option.text.trim() : '']);
+}
+return out;
+"""
+
+
+class NavigationPlanner:
+    def __init__(self, driver, waits, metrics=None, throttle=None):
+        self.driver = driver
+        self.waits = waits
+        self.metrics = metrics
+        self.throttle = throttle  # Called before every selection (each one hits the portal)
+        self.current = {}  # level -> (by, value) we last selected
+        self.issued = 0
+        self.saved = 0
+        self.resets = 0
+
+    def reset(self):
+        """Forget everything (after a page load)"""
+        self.current = {}
+
+    def record(self, level, by, value):
+        """Note a selection made outside the planner (e.g. select_state)"""
+        self.current[level] = (by, value)
+        for child in LEVELS[LEVELS.index(level) + 1:]:
+            self.current.pop(child, None)
+
+    def read_selection(self):
+        """Live [value, text] of each dropdown, or None if the page cannot be read"""
+        try:
+            return self.driver.execute_script(SELECTION_JS)
+        except Exception:
+            return None
+
+    def goto(self, state, district, mandi=None):
+        """Select state/district (by visible text) and optionally a mandi (by value)
+
+        Returns the number of selections that were actually issued.
+        """
+        path = [('state', 'text', state), ('district', 'text', district)]
+        if mandi is not None:
+            path.append(('mandi', 'value', mandi))
+
+        live = self.read_selection()
+        changed = False
+        issued = 0
+        for depth, (level, by, value) in enumerate(path):
+            index = LEVELS.index(level)
+            if not changed and self.current.get(level) == (by, value):
+                if self._live_value(live, index, by) != value:
+                    # The page lost a selection we made: re-select from here down
+                    self.resets += 1
+                elif depth + 1 < len(path) or not self._live_value(live, index + 1, 'value'):
+                    # Still in place, and no deeper selection is hiding this level's results
+                    self.saved += 1
+                    self._count('skipped', level)
+                    continue
+            self._select(level, by, value)
+            changed = True
+            issued += 1
+        return issued
+
+    def _live_value(self, live, index, by):
+        """Selected value (or visible text) of the dropdown at `index`, None if unknown"""
+        if live is None or index >= len(live):
+            return None
+        return live[index][0] if by == 'value' else live[index][1]
+
+    def _select(self, level, by, value):
+        with self._span(level):
+            if self.throttle:
+                self.throttle()
+            dropdowns = self.driver.find_elements(By.CSS_SELECTOR, "select")
+            select = Select(dropdowns[LEVELS.index(level)])
+            before = self.waits.snapshot()
+            if by == 'value':
+                select.select_by_value(value)
+            else:
+                select.select_by_visible_text(value)
+            self.waits.wait_after_select(level, before)
+        self.record(level, by, value)
+        self.issued += 1
+        self._count('issued', level)
+
+    def _span(self, level):
+        return self.metrics.span('select', step=level) if self.metrics else nullcontext()
+
+    def _count(self, outcome, level):
+        if self.metrics:
+            self.metrics.incr('transitions', outcome=outcome, level=level)
+
+    def print_summary(self):
+        total = self.issued + self.saved
+        if total:
+            print(f"\nNavigation: {self.issued} selections issued, {self.saved} of {total} skipped "
+                  f"(already in place), {self.resets} parents re-selected after a page reset")
@@ -0,0 +1,273 @@
+"""Asyncio scheduler for district units with a global request budget.
+
+An event loop hands districts from a priority queue to `concurrency` driver
+slots. Each slot is one FocusedEnamScraper pinned to its own thread, so the
+blocking Selenium calls never share a driver or a SQLite connection. Every
+request to the portal (page load or dropdown selection) first takes a token
+from one shared `TokenBucket`, so the configured requests/sec holds however
+many slots are busy, and nobody sleeps for a fixed time.
+
+Large districts (by mandi counts from earlier ledger runs) are scheduled
+first. Failed units are retried with exponential backoff plus full jitter,
+ahead of fresh work once their delay has passed.
+"""
+import asyncio
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from enam_scraper.fingerprints import FingerprintStore
+from enam_scraper.ledger import WorkLedger, estimated_sizes
+from enam_scraper.metrics import Metrics
+from enam_scraper.parallel import MAX_WORKERS_PER_HOST, discover_districts
+from enam_scraper.scraper import ENAM_URL, FocusedEnamScraper, open_ledger, save_incremental, save_records
+
+DEFAULT_RATE = 2.0  # portal requests per second, across all slots
+DEFAULT_RETRIES = 3
+BACKOFF_BASE = 2
+BACKOFF_MAX = 120
+STOP = 2  # Queue priority of the shutdown sentinel: after every retry (0) and fresh unit (1)
+
+
+class TokenBucket:
+    """Thread-safe token bucket; `acquire` blocks until a request may be sent"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.waited = 0.0
+
+    def reserve(self):
+        """Take a token (possibly borrowing ahead); returns how long to wait before using it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            self.waited += delay
+            return delay
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_MAX):
+    """Exponential backoff with full jitter for the given retry (1-based)"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class _Slot:
+    """One scraper and the single thread that is allowed to drive it"""
+
+    def __init__(self, number):
+        self.number = number
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"enam-slot-{number}")
+        self.scraper = None
+
+    async def run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def close(self):
+        if self.scraper:
+            self.executor.submit(_close_scraper, self.scraper).result()
+        self.executor.shutdown()
+
+
+def _close_scraper(scraper):
+    """Quit the driver and close the slot's SQLite connections (on the thread that opened them)"""
+    scraper.close()
+    for store in (scraper.ledger, scraper.fingerprints):
+        if store:
+            store.close()
+
+
+def _scrape_unit(scraper, state, district):
+    """Scrape one district on the slot's thread; returns (records, failed)"""
+    if scraper.navigator.current.get('state') != ('text', state):
+        if not scraper.open_state(state):
+            return [], True
+    failures = len(scraper.failures)
+    scraper.data = []
+    with scraper.metrics.span('district'):
+        scraper.process_single_district(state, district)
+    return scraper.data, len(scraper.failures) > failures
+
+
+class AsyncOrchestrator:
+    def __init__(self, state, concurrency=2, rate=DEFAULT_RATE, retries=DEFAULT_RETRIES, base_url=ENAM_URL,
+                 lean=False, metrics=None, archive_dir=None, ledger_path=None, fingerprints_path=None, sink=None):
+        if concurrency > MAX_WORKERS_PER_HOST:
+            print(f"! Limiting concurrency to {MAX_WORKERS_PER_HOST} (per-host politeness cap)")
+            concurrency = MAX_WORKERS_PER_HOST
+        self.state = state
+        self.concurrency = concurrency
+        self.retries = retries
+        self.bucket = TokenBucket(rate)
+        self.metrics = metrics or Metrics()
+        self.options = dict(base_url=base_url, lean=lean, archive_dir=archive_dir)
+        self.ledger_path = ledger_path
+        self.fingerprints_path = fingerprints_path
+        self.sink = sink
+        self.data = []
+        self.gave_up = []
+        self._order = itertools.count()
+
+    def _new_scraper(self):
+        ledger = WorkLedger(self.ledger_path) if self.ledger_path else None
+        fingerprints = FingerprintStore(self.fingerprints_path) if self.fingerprints_path else None
+        # Each slot counts into its own Metrics (merged at the end) so threads never share one
+        metrics = Metrics(log_path=self.metrics.log_path)
+        return FocusedEnamScraper(ledger=ledger, fingerprints=fingerprints, metrics=metrics,
+                                  keep_open=True, throttle=self.bucket.acquire, **self.options)
+
+    def _put(self, queue, district, attempt, size):
+        # Retries first (their backoff already passed), then the largest districts
+        queue.put_nowait(((0 if attempt else 1), -size, next(self._order), district, attempt, size))
+
+    async def run(self, districts, sizes=None):
+        """Scrape the given districts; returns raw records (empty when streaming to a sink)"""
+        sizes = sizes or {}
+        queue = asyncio.PriorityQueue()
+        for district in districts:
+            self._put(queue, district, 0, sizes.get(district, 0))
+        outstanding = len(districts)
+        all_done = asyncio.Event()
+        if not districts:
+            all_done.set()
+
+        retry_tasks = set()  # Held so pending retries are not garbage-collected
+        errors = []
+
+        async def requeue(district, attempt, size, delay):
+            await asyncio.sleep(delay)
+            self._put(queue, district, attempt, size)
+
+        async def worker(slot):
+            nonlocal outstanding
+            while True:
+                _, _, _, district, attempt, size = await queue.get()
+                if district is None:
+                    return
+                finished = True
+                try:
+                    try:
+                        if slot.scraper is None:
+                            slot.scraper = await slot.run(self._new_scraper)
+                        records, failed = await slot.run(_scrape_unit, slot.scraper, self.state, district)
+                    except Exception as e:
+                        print(f"  ✗ [slot {slot.number}] {district} failed: {e}")
+                        records, failed = [], True
+                        if slot.scraper:
+                            slot.scraper.navigator.reset()
+
+                    if self.sink:
+                        self.sink.write_many(records)
+                    else:
+                        self.data.extend(records)
+
+                    if failed and attempt < self.retries:
+                        delay = backoff_delay(attempt + 1)
+                        self.metrics.incr('retries_scheduled')
+                        print(f"  ! [slot {slot.number}] {district}: "
+                              f"retry {attempt + 1}/{self.retries} in {delay:.1f}s")
+                        task = asyncio.create_task(requeue(district, attempt + 1, size, delay))
+                        retry_tasks.add(task)
+                        task.add_done_callback(retry_tasks.discard)
+                        finished = False
+                        continue
+                    if failed:
+                        self.gave_up.append(district)
+                    print(f"  ✓ [slot {slot.number}] {district}: {len(records)} raw records")
+                except Exception as e:
+                    # Not a scrape failure (e.g. the sink could not write): stop the run and re-raise below
+                    print(f"  ✗ [slot {slot.number}] {district}: {e}")
+                    errors.append(e)
+                    all_done.set()
+                finally:
+                    if finished:
+                        outstanding -= 1
+                        if outstanding == 0:
+                            all_done.set()
+
+        slots = [_Slot(number) for number in range(1, self.concurrency + 1)]
+        tasks = [asyncio.create_task(worker(slot)) for slot in slots]
+        try:
+            await all_done.wait()
+        finally:
+            for task in retry_tasks:
+                task.cancel()
+            if errors:
+                for task in tasks:
+                    task.cancel()
+            for _ in tasks:
+                queue.put_nowait((STOP, 0, next(self._order), None, 0, 0))
+            await asyncio.gather(*tasks, *retry_tasks, return_exceptions=True)
+            for slot in slots:
+                slot.close()
+                if slot.scraper:
+                    self.metrics.merge(slot.scraper.metrics.snapshot())
+                    slot.scraper.metrics.close()
+        if errors:
+            raise errors[0]
+        return self.data
+
+
+def run_async_scraper(state="Maharashtra", max_districts=None, concurrency=2, rate=DEFAULT_RATE,
+                      retries=DEFAULT_RETRIES, archive_dir=None, ledger_path=None, resume=False,
+                      fingerprints_path=None, sink=None, base_url=ENAM_URL, metrics=None, lean=False):
+    """Scrape all districts of a state with `concurrency` drivers sharing a `rate` requests/sec budget"""
+    started = time.time()
+    metrics = metrics or Metrics()
+    sizes = estimated_sizes(state, ledger_path)
+
+    orchestrator = AsyncOrchestrator(state, concurrency, rate, retries, base_url, lean, metrics, archive_dir,
+                                     None, fingerprints_path, sink)
+    districts = discover_districts(state, base_url, metrics, lean)
+    if max_districts is not None:
+        districts = districts[:max_districts]
+    if not districts:
+        print("✗ No districts to process")
+        return None
+
+    ledger = open_ledger(state, ledger_path, resume)
+    if ledger and sink:
+        # Records committed by earlier, interrupted runs
+        sink.write_many(ledger.iter_records(state))
+    if ledger:
+        ledger.add_units(state, names=districts)
+        remaining = [district for district in districts if not ledger.district_done(state, district)]
+        print(f"{len(districts) - len(remaining)} districts already done in ledger")
+        districts = remaining
+        orchestrator.ledger_path = ledger.path
+
+    print(f"Processing {len(districts)} districts with {orchestrator.concurrency} drivers at {rate} requests/sec"
+          + (f" (largest first, sizes from {len(sizes)} districts)" if sizes else ""))
+    data = asyncio.run(orchestrator.run(districts, sizes))
+    print(f"\nToken bucket: waited {orchestrator.bucket.waited:.1f}s in total for request budget")
+    if orchestrator.gave_up:
+        print(f"✗ Gave up on {len(orchestrator.gave_up)} districts after {retries} retries: "
+              f"{', '.join(orchestrator.gave_up)}")
+    if sink:
+        return None
+
+    if ledger:
+        # Includes records committed by earlier, interrupted runs
+        df = save_records(ledger.records(state), metrics)
+    else:
+        df = save_records(data, metrics)
+    if fingerprints_path:
+        save_incremental(df, fingerprints_path, started)
+    return df
@@ -0,0 +1,168 @@
+"""Parallel scraping across a pool of headless Chrome worker processes.
+
+Each worker process owns one FocusedEnamScraper (its own driver and temp
+profile) for its whole lifetime and pulls districts from a shared queue, so
+fast workers simply take more districts. Raw records from all workers are
+merged and cleaned/de-duplicated once at the end.
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.util import Finalize
+
+from enam_scraper.fingerprints import FingerprintStore
+from enam_scraper.ledger import WorkLedger
+from enam_scraper.metrics import Metrics
+from enam_scraper.scraper import ENAM_URL, FocusedEnamScraper, open_ledger, save_incremental, save_records
+
+# Politeness cap: never open more concurrent sessions than this against enam.gov.in
+MAX_WORKERS_PER_HOST = 4
+
+_worker_scraper = None
+_worker_state = None
+
+
+def close_scraper(scraper):
+    """Quit the driver and delete its temporary Chrome profile"""
+    scraper.close()
+
+
+def discover_districts(state, base_url=ENAM_URL, metrics=None, lean=False):
+    """Open the page once and list the districts of a state"""
+    scraper = FocusedEnamScraper(base_url=base_url, metrics=metrics, lean=lean)
+    try:
+        if not scraper.open_state(state):
+            return []
+        return scraper.get_available_districts()
+    finally:
+        close_scraper(scraper)
+
+
+def _init_worker(archive_dir=None, ledger_path=None, fingerprints_path=None, base_url=ENAM_URL,
+                 metrics_log=None, lean=False):
+    global _worker_scraper
+    ledger = WorkLedger(ledger_path) if ledger_path else None
+    fingerprints = FingerprintStore(fingerprints_path) if fingerprints_path else None
+    _worker_scraper = FocusedEnamScraper(archive_dir=archive_dir, ledger=ledger, fingerprints=fingerprints,
+                                         base_url=base_url, metrics=Metrics(metrics_log), lean=lean)
+    # Runs when the pool shuts the worker process down
+    Finalize(None, close_scraper, args=(_worker_scraper,), exitpriority=10)
+
+
+def _scrape_district(state, district):
+    """Scrape one district in the calling worker process; returns raw records + metric totals
+
+    Raises if the worker cannot open the state, after marking the district
+    failed in the ledger so a retry round picks it up.
+    """
+    global _worker_state
+    scraper = _worker_scraper
+    scraper.metrics.reset()
+    if _worker_state != state:
+        if not scraper.open_state(state):
+            error = RuntimeError(f"could not open {state} on the contact page")
+            scraper._fail_unit(state, district, '', error)
+            raise error
+        _worker_state = state
+
+    scraper.data = []
+    with scraper.metrics.span('district'):
+        scraper.process_single_district(state, district)
+    return scraper.data, scraper.metrics.snapshot()
+
+
+def _run_pool(state, districts, workers, archive_dir, ledger_path, fingerprints_path, sink=None,
+              base_url=ENAM_URL, metrics=None, lean=False):
+    return run_units([(state, district) for district in districts], workers, archive_dir, ledger_path,
+                     fingerprints_path, sink, base_url, metrics, lean)
+
+
+def run_units(units, workers, archive_dir, ledger_path, fingerprints_path, sink=None,
+              base_url=ENAM_URL, metrics=None, lean=False):
+    """Scrape (state, district) units with a pool of workers, handing them out in the given order"""
+    data = []
+    metrics_log = metrics and metrics.log_path
+    single_state = len({state for state, _ in units}) == 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(archive_dir, ledger_path, fingerprints_path, base_url,
+                                       metrics_log, lean)) as pool:
+        futures = {pool.submit(_scrape_district, state, district): (state, district)
+                   for state, district in units}
+        try:
+            for i, future in enumerate(as_completed(futures), 1):
+                state, district = futures[future]
+                label = district if single_state else f"{state}/{district}"
+                try:
+                    records, worker_metrics = future.result()
+                except Exception as e:
+                    print(f"  ✗ [{i}/{len(units)}] {label} failed: {e}")
+                    continue
+                if metrics:
+                    metrics.merge(worker_metrics)
+                if sink:
+                    sink.write_many(records)  # A sink error (e.g. StreamClosed) ends the run
+                else:
+                    data.extend(records)
+                print(f"  ✓ [{i}/{len(units)}] {label}: {len(records)} raw records")
+        except BaseException:
+            pool.shutdown(cancel_futures=True)
+            raise
+    return data
+
+
+def run_parallel_scraper(state="Maharashtra", max_districts=None, workers=2, archive_dir=None,
+                         ledger_path=None, resume=False, fingerprints_path=None, sink=None,
+                         base_url=ENAM_URL, metrics=None, lean=False):
+    """Scrape all districts of a state with `workers` Chrome processes"""
+    started = time.time()
+    metrics = metrics or Metrics()
+    if workers > MAX_WORKERS_PER_HOST:
+        print(f"! Limiting workers to {MAX_WORKERS_PER_HOST} (per-host politeness cap)")
+        workers = MAX_WORKERS_PER_HOST
+
+    print(f"Discovering districts for {state}...")
+    districts = discover_districts(state, base_url, metrics, lean)
+    if max_districts is not None:
+        districts = districts[:max_districts]
+    if not districts:
+        print("✗ No districts to process")
+        return None
+
+    ledger = open_ledger(state, ledger_path, resume)
+    if ledger and sink:
+        # Records committed by earlier, interrupted runs
+        sink.write_many(ledger.iter_records(state))
+    if ledger:
+        ledger.add_units(state, names=districts)
+        remaining = [district for district in districts if not ledger.district_done(state, district)]
+        print(f"{len(districts) - len(remaining)} districts already done in ledger")
+        districts = remaining
+
+    data = []
+    if districts:
+        workers = min(workers, len(districts))
+        print(f"Processing {len(districts)} districts with {workers} workers")
+        data = _run_pool(state, districts, workers, archive_dir, ledger and ledger.path, fingerprints_path,
+                         sink, base_url, metrics, lean)
+
+    if ledger:
+        for attempt in range(1, ledger.max_attempts):
+            retry = ledger.retryable_districts(state)
+            if not retry:
+                break
+            delay = ledger.backoff_delay(attempt)
+            print(f"\nRetry round {attempt}: {len(retry)} districts with failed units (waiting {delay}s)")
+            time.sleep(delay)
+            _run_pool(state, retry, min(workers, len(retry)), archive_dir, ledger.path, fingerprints_path,
+                      sink, base_url, metrics, lean)
+    if sink:
+        return None
+
+    if ledger:
+        # Includes records committed by earlier, interrupted runs
+        df = save_records(ledger.records(state), metrics)
+    else:
+        df = save_records(data, metrics)
+
+    if fingerprints_path:
+        save_incremental(df, fingerprints_path, started)
+    return df
@@ -0,0 +1,251 @@
+"""Local stand-in for the eNAM APMC contact page, for offline benchmarks.
+
+Serves a page with the same language → state → district → mandi dropdown
+cascade as the portal. The dropdowns and contact tables are filled by fetch()
+calls, and every response can be delayed to mimic the real site's latency.
+The data comes from a clean output file of an earlier run, or is generated:
+
+    python -m enam_scraper.portal_server --data enam_clean_data_1700000000.csv --latency 0.3
+    python -m enam_scraper.portal_server --states 28 --districts 8 --mandis 6
+
+Point the scraper at it with `--base-url http://127.0.0.1:8766/web/apmc-contact-details`.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+PAGE_PATH = '/web/apmc-contact-details'
+
+STATES = [
+    'Andhra Pradesh', 'Assam', 'Bihar', 'Chandigarh', 'Chhattisgarh', 'Goa', 'Gujarat', 'Haryana',
+    'Himachal Pradesh', 'Jammu and Kashmir', 'Jharkhand', 'Karnataka', 'Kerala', 'Madhya Pradesh',
+    'Maharashtra', 'Nagaland', 'Odisha', 'Puducherry', 'Punjab', 'Rajasthan', 'Tamil Nadu',
+    'Telangana', 'Tripura', 'Uttar Pradesh', 'Uttarakhand', 'West Bengal', 'Delhi', 'Ladakh',
+]
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><title>APMC Contact Details</title>{head_assets}</head>
+<body>
+<h2>APMC Contact Details</h2>{body_assets}
+<form>
+<select id="language"><option value="en">English</option><option value="hi">Hindi</option></select>
+<select id="state"><option value="">Select State</option>{state_options}</select>
+<select id="district"><option value="">Select District</option></select>
+<select id="mandi"><option value="">Select APMC</option></select>
+</form>
+<div id="results"></div>
+<script>
+function get(path, params) {{
+    return fetch(path + '?' + new URLSearchParams(params)).then(function (r) {{ return r.json(); }});
+}}
+function fill(select, placeholder, items) {{
+    select.innerHTML = '<option value="">' + placeholder + '</option>';
+    items.forEach(function (item) {{
+        var option = document.createElement('option');
+        option.value = item.id;
+        option.text = item.name;
+        select.appendChild(option);
+    }});
+}}
+function row(label, value) {{
+    var tr = document.createElement('tr');
+    [label, value].forEach(function (text) {{
+        var td = document.createElement('td');
+        td.textContent = text;
+        tr.appendChild(td);
+    }});
+    return tr;
+}}
+function show(records) {{
+    var results = document.getElementById('results');
+    results.innerHTML = '';
+    records.forEach(function (record) {{
+        var table = document.createElement('table');
+        table.className = 'contact-details';
+        table.appendChild(row('Mandi Name', record.mandi_name));
+        table.appendChild(row('Address', record.address));
+        table.appendChild(row('Contact Details', record.contact_details));
+        results.appendChild(table);
+    }});
+}}
+var state = document.getElementById('state');
+var district = document.getElementById('district');
+var mandi = document.getElementById('mandi');
+state.addEventListener('change', function () {{
+    fill(mandi, 'Select APMC', []);
+    show([]);
+    get('/api/districts', {{state_id: state.value}}).then(function (items) {{
+        fill(district, 'Select District', items);
+    }});
+}});
+district.addEventListener('change', function () {{
+    var params = {{state_id: state.value, district_id: district.value}};
+    get('/api/mandis', params).then(function (items) {{ fill(mandi, 'Select APMC', items); }});
+    get('/api/details', params).then(show);
+}});
+mandi.addEventListener('change', function () {{
+    get('/api/details', {{state_id: state.value, district_id: district.value, apmc_id: mandi.value}})
+        .then(show);
+}});
+</script>
+</body>
+</html>
+"""
+
+
+def synthetic_portal(states=3, districts=8, mandis=6, seed=0):
+    """Generated {state: {district: [record, ...]}} data shaped like the portal's"""
+    rng = random.Random(seed)
+    data = {}
+    for state in STATES[:states]:
+        data[state] = {}
+        for d in range(1, districts + 1):
+            district = f"{state} District {d}"
+            std = str(rng.randint(100, 9999))
+            digits = 10 - len(std)  # STD code + number is always 10 digits
+            data[state][district] = [{
+                'mandi_name': f"APMC {district} Yard {m}",
+                'address': f"Market Yard {m}, Station Road, {district} - {rng.randint(110000, 855999)}",
+                'contact_details': f"0{std}-{rng.randint(10 ** (digits - 1), 10 ** digits - 1)}, "
+                                   f"{rng.randint(6000000000, 9999999999)}, apmc{d}{m}@example.com",
+            } for m in range(1, mandis + 1)]
+    return data
+
+
+def load_portal(path):
+    """Portal data recorded in a clean output file (.csv/.jsonl/.parquet)"""
+    from enam_scraper.sinks import read_output
+
+    data = {}
+    for record in read_output(path).astype(str).to_dict('records'):
+        mandis = data.setdefault(record['state'], {}).setdefault(record['district'], [])
+        mandis.append({field: record[field] for field in ('mandi_name', 'address', 'contact_details')})
+    return data
+
+
+def count_mandis(data, states=None, max_districts=None):
+    """Mandis a scrape of `states` (all by default) should find"""
+    total = 0
+    for state in states or data:
+        districts = list(data[state].values())
+        total += sum(len(mandis) for mandis in districts[:max_districts])
+    return total
+
+
+def page_assets(count):
+    """<head>/<body> markup pulling in `count` images plus a font, a stylesheet and a tracker"""
+    if not count:
+        return '', ''
+    head = ('<link rel="stylesheet" href="/static/site.css">'
+            '<script async src="/static/analytics.js"></script>')
+    body = ''.join(f'<img src="/static/banner{i}.png" alt="">' for i in range(count))
+    return head, body
+
+
+STATIC = {
+    '.css': ('text/css', b"@font-face{font-family:Portal;src:url(/static/portal.woff2)}"
+                         b"body{font-family:Portal,sans-serif}"),
+    '.js': ('application/javascript', b"window.__tracked = true;"),
+    '.png': ('image/png', b"\x89PNG\r\n\x1a\n" + bytes(200_000)),
+    '.woff2': ('font/woff2', bytes(100_000)),
+}
+
+
+def make_handler(data, latency=0.0, jitter=0.0, assets=0):
+    states = list(data)
+    districts = {state: list(data[state]) for state in states}
+    state_options = ''.join(f'<option value="{i}">{escape(state)}</option>' for i, state in enumerate(states))
+    head_assets, body_assets = page_assets(assets)
+    page = PAGE_TEMPLATE.format(state_options=state_options, head_assets=head_assets,
+                                body_assets=body_assets).encode('utf-8')
+    hits = Counter()
+
+    class PortalHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _send(self, status, content_type, body):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _json(self, payload):
+            self._send(200, 'application/json', json.dumps(payload).encode('utf-8'))
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            params = {key: values[0] for key, values in parse_qs(parts.query).items()}
+            hits[parts.path] += 1
+            if latency or jitter:
+                time.sleep(latency + random.uniform(0, jitter))
+            try:
+                if parts.path == PAGE_PATH:
+                    self._send(200, 'text/html; charset=utf-8', page)
+                    return
+                if parts.path.startswith('/static/'):
+                    content_type, body = STATIC.get(parts.path[parts.path.rfind('.'):], ('text/plain', b''))
+                    self._send(200, content_type, body)
+                    return
+                state = states[int(params['state_id'])]
+                if parts.path == '/api/districts':
+                    self._json([{'id': i, 'name': name} for i, name in enumerate(districts[state])])
+                    return
+                mandis = data[state][districts[state][int(params['district_id'])]]
+                if parts.path == '/api/mandis':
+                    self._json([{'id': i, 'name': record['mandi_name']} for i, record in enumerate(mandis)])
+                elif parts.path == '/api/details':
+                    if params.get('apmc_id'):
+                        mandis = [mandis[int(params['apmc_id'])]]
+                    self._json(mandis)
+                else:
+                    self._send(404, 'text/plain', b'not found')
+            except (KeyError, IndexError, ValueError):
+                self._send(400, 'text/plain', b'bad request')
+
+        def log_message(self, format, *args):
+            pass
+
+    PortalHandler.hits = hits
+    return PortalHandler
+
+
+def serve(data, host='127.0.0.1', port=8766, latency=0.0, jitter=0.0, assets=0):
+    """Start the stand-in portal (returns the server; call serve_forever on it)"""
+    server = ThreadingHTTPServer((host, port), make_handler(data, latency, jitter, assets))
+    server.daemon_threads = True
+    server.url = f"http://{host}:{server.server_port}{PAGE_PATH}"
+    print(f"✓ Serving {count_mandis(data)} mandis in {len(data)} states on {server.url} "
+          f"(latency {latency}s + up to {jitter}s)")
+    return server
+
+
+def serve_in_background(data, **kwargs):
+    """Start the stand-in portal on a daemon thread; returns the server"""
+    server = serve(data, **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a local stand-in of the eNAM APMC contact page")
+    parser.add_argument("--data", default=None, help="Clean output file to serve (default: generated data)")
+    parser.add_argument("--states", type=int, default=3, help="Generated states")
+    parser.add_argument("--districts", type=int, default=8, help="Generated districts per state")
+    parser.add_argument("--mandis", type=int, default=6, help="Generated mandis per district")
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay (s) added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay (s) up to this much")
+    parser.add_argument("--assets", type=int, default=0,
+                        help="Images on the page (plus a font, stylesheet and tracker), to measure lean mode")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+    portal = load_portal(args.data) if args.data else synthetic_portal(args.states, args.districts, args.mandis)
+    serve(portal, port=args.port, latency=args.latency, jitter=args.jitter,
+          assets=args.assets).serve_forever()
@@ -0,0 +1,66 @@
+"""Compact raw record type shared by every extractor.
+
+A raw record used to be a fresh 5-key dict, and a full run keeps every one of
+them in memory until the end. `MandiRecord` stores the same five fields in
+`__slots__` (no per-record dict) and interns `state` and `district`, which are
+repeated on every record of a district, so they are held once per run rather
+than once per record. It still reads and writes like the old dict
+(`record['address']`, `.get`, `dict(record)`), so code handling records from
+the ledger or fingerprint store needs no changes. `records_frame` builds the
+DataFrame column by column, with no intermediate list of dicts.
+"""
+import sys
+from collections.abc import Mapping
+from operator import attrgetter, itemgetter
+
+import pandas as pd
+
+FIELDS = ('state', 'district', 'mandi_name', 'address', 'contact_details')
+INTERNED = ('state', 'district')
+
+
+class MandiRecord(Mapping):
+    __slots__ = FIELDS
+
+    def __init__(self, state, district, mandi_name='', address='', contact_details=''):
+        self.state = sys.intern(state or '')
+        self.district = sys.intern(district or '')
+        self.mandi_name = mandi_name or ''
+        self.address = address
+        self.contact_details = contact_details
+
+    @classmethod
+    def from_mapping(cls, record):
+        return cls(*(record.get(field, '') for field in FIELDS))
+
+    def __getitem__(self, key):
+        if key not in FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in FIELDS:
+            raise KeyError(key)
+        setattr(self, key, sys.intern(value) if key in INTERNED else value)
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def __reduce__(self):
+        # Pickles as a plain tuple of fields (for worker processes)
+        return MandiRecord, tuple(getattr(self, field) for field in FIELDS)
+
+    def __repr__(self):
+        return f"MandiRecord({', '.join(f'{field}={getattr(self, field)!r}' for field in FIELDS)})"
+
+
+def records_frame(records):
+    """DataFrame of raw records (MandiRecords or dicts), built one column at a time"""
+    if not isinstance(records, list):
+        records = list(records)
+    compact = all(type(record) is MandiRecord for record in records)
+    getter = attrgetter if compact else itemgetter
+    return pd.DataFrame({field: list(map(getter(field), records)) for field in FIELDS}, columns=list(FIELDS))
@@ -0,0 +1,73 @@
+"""Local stand-in server that replays recorded eNAM XHR responses.
+
+Serves the `recorded` request/response pairs of an endpoint map written by
+`direct.discover_endpoints`, so the direct engine can be exercised offline:
+
+    python -m enam_scraper.replay_server enam_endpoints.json --port 8765
+"""
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+
+def _normalize(text):
+    """Order-insensitive form of a query string or request body"""
+    try:
+        payload = json.loads(text)
+        return json.dumps(payload, sort_keys=True)
+    except ValueError:
+        return tuple(sorted(parse_qsl(text, keep_blank_values=True)))
+
+
+def _key(method, url, body):
+    parts = urlsplit(url)
+    return method.upper(), parts.path, _normalize(parts.query), _normalize(body or '')
+
+
+def make_handler(recorded):
+    responses = {}
+    for pair in recorded:
+        responses[_key(pair['method'], pair['url'], pair['body'])] = pair['response']
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, like the real portal
+
+        def _reply(self, method):
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length).decode('utf-8') if length else ''
+            payload = responses.get(_key(method, self.path, body))
+            status = 200 if payload is not None else 404
+            data = (payload if payload is not None else 'not recorded').encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._reply('GET')
+
+        def do_POST(self):
+            self._reply('POST')
+
+        def log_message(self, format, *args):
+            pass
+
+    return ReplayHandler
+
+
+def serve(endpoints_path, host='127.0.0.1', port=8765):
+    """Start the replay server (returns the server; call serve_forever on it)"""
+    with open(endpoints_path, encoding='utf-8') as f:
+        recorded = json.load(f)['recorded']
+    server = ThreadingHTTPServer((host, port), make_handler(recorded))
+    print(f"✓ Replaying {len(recorded)} recorded responses on http://{host}:{server.server_port}")
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded eNAM XHR responses locally")
+    parser.add_argument("endpoints", help="Endpoint map written by discover_endpoints")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    serve(args.endpoints, port=args.port).serve_forever()
@@ -1,8 +1,64 @@
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import Select, WebDriverWait
+
+from enam_scraper import extraction
+from enam_scraper.cleaning import clean_data
+from enam_scraper.addresses import add_address_columns
+from enam_scraper.contacts import add_contact_columns
+from enam_scraper.dedup import DedupIndex, collapse_near_duplicates
+from enam_scraper.archive import SnapshotArchive
+from enam_scraper.fingerprints import FingerprintStore, page_fingerprint, write_delta
+from enam_scraper.ledger import DEFAULT_LEDGER, WorkLedger
+from enam_scraper.metrics import Metrics
+from enam_scraper.navigation import NavigationPlanner
+from enam_scraper.records import records_frame
+from enam_scraper.sinks import iter_clean_records, open_sink, read_output, write_output
+from enam_scraper.waits import WaitEngine
+
+ENAM_URL = "https://enam.gov.in/web/apmc-contact-details"
+
+# Lean mode: resources the contact page does not need for its dropdowns/results
+LEAN_BLOCKED_URLS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.webp', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.mp3',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*facebook.net*', '*hotjar.com*', '*/analytics.js*',
+]
+LEAN_PREFS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.managed_default_content_settings.fonts': 2,
+    'profile.default_content_setting_values.notifications': 2,
+}
+
+
 class FocusedEnamScraper:
-    def __init__(self):
+    def __init__(self, performance_log=False, archive_dir=None, ledger=None, fingerprints=None, sink=None,
+                 base_url=ENAM_URL, metrics=None, lean=False, keep_open=False, throttle=None):
         self.driver = None
+        self.base_url = base_url
+        self.lean = lean
+        self.keep_open = keep_open  # Leave the driver running after a scrape so it can be reused
+        self.throttle = throttle  # Called before every request to the portal (rate limiting)
+        self.failures = []  # (district, mandi) units that failed during this scraper's life
         self.wait = None
         self.data = []
+        self.performance_log = performance_log
+        self.archive = SnapshotArchive(archive_dir) if archive_dir else None
+        self.ledger = ledger
+        self.fingerprints = fingerprints
+        self.sink = sink
+        self.dedup = DedupIndex()
+        self._unit = None  # (state, district, mandi) whose page is being extracted
+        self._page_records = []  # Everything extracted from that page, duplicates included
+        self.metrics = metrics or Metrics()
         self.setup_driver()
 
     def setup_driver(self):
@@ -13,30 +69,67 @@ class FocusedEnamScraper:
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--window-size=1920,1080")
+        if self.performance_log:
+            # Lets direct.discover_endpoints read the XHR traffic
+            chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        if self.lean:
+            # Return from get() at DOMContentLoaded; the waits cover the XHR cascade
+            chrome_options.page_load_strategy = 'eager'
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+            chrome_options.add_argument("--disable-extensions")
+            chrome_options.add_argument("--disable-background-networking")
+            chrome_options.add_argument("--mute-audio")
+            chrome_options.add_experimental_option('prefs', LEAN_PREFS)
 
         temp_dir = tempfile.mkdtemp(prefix='chrome_user_data_')
         chrome_options.add_argument(f"--user-data-dir={temp_dir}")
+        self.profile_dir = temp_dir
 
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
+            self.driver = self.metrics.instrument(webdriver.Chrome(options=chrome_options))
+            if self.lean:
+                self.block_resources()
             self.wait = WebDriverWait(self.driver, 15)
+            self.waits = WaitEngine(self.driver, metrics=self.metrics)
+            self.navigator = NavigationPlanner(self.driver, self.waits, self.metrics, self.throttle)
             print("✓ Driver setup successful!")
         except Exception as e:
             print(f"Driver setup failed: {e}")
+            shutil.rmtree(temp_dir, ignore_errors=True)
             raise
 
+    def block_resources(self, patterns=LEAN_BLOCKED_URLS):
+        """Block images, fonts, media and trackers through the DevTools protocol"""
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns)})
+            print(f"✓ Lean mode: blocking {len(patterns)} resource patterns")
+        except Exception as e:
+            print(f"! Could not block resources: {e}")
+
+    def close(self):
+        """Quit the driver and delete its temporary Chrome profile"""
+        try:
+            if self.driver:
+                self.driver.quit()
+        except Exception as e:
+            print(f"Error quitting driver: {e}")
+        self.driver = None
+        shutil.rmtree(getattr(self, 'profile_dir', ''), ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
     def scrape_step_by_step(self, state="Gujarat", max_districts=None):
         """Scrape data step by step with detailed extraction at each level"""
         try:
             print(f"Starting step-by-step scrape for {state}...")
-            self.driver.get("https://enam.gov.in/web/apmc-contact-details")
-            time.sleep(5)
-
-            # Step 1: Select English language
-            self.select_language("English")
 
-            # Step 2: Select state
-            state_success = self.select_state(state)
+            # Steps 1-2: Load page, select English language and state
+            state_success = self.open_state(state)
             if not state_success:
                 return self.data
 
@@ -47,13 +140,25 @@ class FocusedEnamScraper:
             # Process all districts if max_districts is None
             districts_to_process = districts if max_districts is None else districts[:max_districts]
 
+            if self.ledger:
+                self.ledger.add_units(state, names=districts_to_process)
+
             for i, district in enumerate(districts_to_process):
+                if self.ledger and self.ledger.district_done(state, district):
+                    print(f"\n--- Skipping District {i+1}/{len(districts_to_process)}: {district} (done in ledger) ---")
+                    continue
+
                 print(f"\n--- Processing District {i+1}/{len(districts_to_process)}: {district} ---")
 
                 # Select district and extract data
-                self.process_single_district(state, district)
+                with self.metrics.span('district'):
+                    self.process_single_district(state, district)
+
+                if self.throttle is None:
+                    time.sleep(2)  # Brief pause between districts (a throttle paces requests instead)
 
-                time.sleep(2)  # Brief pause between districts
+            if self.ledger:
+                self.retry_failed_units(state)
 
             return self.data
 
@@ -61,8 +166,39 @@ class FocusedEnamScraper:
             print(f"Error in step-by-step scrape: {e}")
             return self.data
         finally:
-            if self.driver:
-                self.driver.quit()
+            if self.dedup.rejected:
+                print(f"\nRejected {self.dedup.rejected} duplicate records in flight")
+            self.waits.print_summary()
+            self.navigator.print_summary()
+            if not self.keep_open:
+                self.close()
+
+    def retry_failed_units(self, state):
+        """Re-visit districts with failed units, backing off between rounds"""
+        for attempt in range(1, self.ledger.max_attempts):
+            districts = self.ledger.retryable_districts(state)
+            if not districts:
+                return
+            delay = self.ledger.backoff_delay(attempt)
+            print(f"\nRetry round {attempt}: {len(districts)} districts with failed units (waiting {delay}s)")
+            time.sleep(delay)
+            for district in districts:
+                with self.metrics.span('district', retry=True):
+                    self.process_single_district(state, district)
+
+    def open_page(self):
+        """Load the contact page and select English"""
+        with self.metrics.span('page_load'):
+            self._throttle()
+            self.driver.get(self.base_url)
+            self.waits.wait_for_page_ready()
+        self.navigator.reset()
+        return self.select_language("English")
+
+    def open_state(self, state):
+        """Load the contact page and select English + the given state"""
+        self.open_page()
+        return self.select_state(state)
 
     def select_language(self, language="English"):
         """Select language from first dropdown"""
@@ -70,9 +206,13 @@ class FocusedEnamScraper:
             dropdowns = self.driver.find_elements(By.CSS_SELECTOR, "select")
             if dropdowns:
                 lang_select = Select(dropdowns[0])
-                lang_select.select_by_visible_text(language)
-                print(f"✓ Selected language: {language}")
-                time.sleep(3)
+                with self.metrics.span('select', step='language'):
+                    self._throttle()
+                    before = self.waits.snapshot()
+                    lang_select.select_by_visible_text(language)
+                    print(f"✓ Selected language: {language}")
+                    self.waits.wait_after_select('language', before)
+                self.navigator.record('language', 'text', language)
                 return True
         except Exception as e:
             print(f"Error selecting language: {e}")
@@ -96,9 +236,13 @@ class FocusedEnamScraper:
 
             if state_dropdown:
                 state_select = Select(state_dropdown)
-                state_select.select_by_visible_text(state_name)
-                print(f"✓ Selected state: {state_name}")
-                time.sleep(4)  # Wait for districts to load
+                with self.metrics.span('select', step='state'):
+                    self._throttle()
+                    before = self.waits.snapshot()
+                    state_select.select_by_visible_text(state_name)
+                    print(f"✓ Selected state: {state_name}")
+                    self.waits.wait_after_select('state', before, index=i)  # Wait for districts to load
+                self.navigator.record('state', 'text', state_name)
                 return True
             else:
                 print(f"✗ State '{state_name}' not found in dropdowns")
@@ -108,13 +252,30 @@ class FocusedEnamScraper:
             print(f"Error selecting state: {e}")
             return False
 
+    def get_available_states(self):
+        """Get list of states from the state dropdown (after the language is selected)"""
+        try:
+            dropdowns = self.driver.find_elements(By.CSS_SELECTOR, "select")
+            if len(dropdowns) > 1:
+                options = [opt.text.strip() for opt in Select(dropdowns[1]).options if opt.get_attribute('value')]
+                states = [text for text in options if text and not text.lower().startswith('select')]
+                print(f"✓ Found {len(states)} states")
+                return states
+
+            print("✗ No state dropdown found")
+            return []
+
+        except Exception as e:
+            print(f"Error getting states: {e}")
+            return []
+
     def get_available_districts(self):
         """Get list of available districts"""
         try:
             dropdowns = self.driver.find_elements(By.CSS_SELECTOR, "select")
 
             # Find district dropdown (usually third)
-            for dropdown in dropdowns[2:]:  # Skip language and state
+            for i, dropdown in enumerate(dropdowns[2:], 2):  # Skip language and state
                 select_obj = Select(dropdown)
                 options = select_obj.options
 
@@ -127,7 +288,8 @@ class FocusedEnamScraper:
                                     not text.lower().startswith('all') and
                                     text != '']
 
-                if valid_districts and len(valid_districts) > 5:  # Likely district dropdown
+                # Likely district dropdown (small states and UTs only have a few, in the usual place)
+                if valid_districts and (len(valid_districts) > 5 or i == 2):
                     print(f"✓ Found {len(valid_districts)} districts")
                     return valid_districts  # CHANGED: Return ALL districts instead of limiting to 10
 
@@ -141,41 +303,64 @@ class FocusedEnamScraper:
     def process_single_district(self, state, district):
         """Process a single district thoroughly"""
         try:
-            # Re-select state and district (dropdowns refresh)
+            # Select the district; the state is only re-selected if the page lost it
             print(f"  Selecting {district}...")
-
-            # Find and select state
-            dropdowns = self.driver.find_elements(By.CSS_SELECTOR, "select")
-            state_select = Select(dropdowns[1])  # Assuming second dropdown is state
-            state_select.select_by_visible_text(state)
-            time.sleep(2)
-
-            # Find and select district
-            dropdowns = self.driver.find_elements(By.CSS_SELECTOR, "select")
-            district_select = Select(dropdowns[2])  # Assuming third dropdown is district
-            district_select.select_by_visible_text(district)
-            time.sleep(4)  # Wait for data/mandis to load
+            self.navigator.goto(state, district)  # Waits for data/mandis to load
 
             print(f"  ✓ Selected {district}, extracting data...")
 
             # First, try to extract data at district level
             extracted_count = len(self.data)
-            self.extract_all_visible_data(state, district)
-            new_extractions = len(self.data) - extracted_count
-
-            if new_extractions > 0:
-                print(f"  ✓ Extracted {new_extractions} records at district level")
+            district_done = self.ledger and self.ledger.is_done(state, district)
+            if district_done:
+                print("  ✓ District-level data already in ledger")
             else:
+                self.extract_all_visible_data(state, district)
+            district_records = self.data[extracted_count:]
+
+            if district_records:
+                print(f"  ✓ Extracted {len(district_records)} records at district level")
+            elif not district_done:
                 print("  ! No data found at district level")
 
             # Then, check if there are mandis to select
-            self.process_mandis_in_district(state, district)
+            mandis_listed = self.process_mandis_in_district(state, district)
+
+            # Committed last so a crash never leaves unregistered mandis behind a done district
+            if mandis_listed and not district_done:
+                self._commit_unit(state, district, '', district_records)
 
         except Exception as e:
             print(f"  ✗ Error processing district {district}: {e}")
+            self.metrics.incr('errors', level='district')
+            self.navigator.reset()
+            self._fail_unit(state, district, '', e)
+        finally:
+            self._drain()
+
+    def _drain(self):
+        """Hand finished records to the sink so they don't pile up in memory"""
+        if self.sink:
+            self.sink.write_many(self.data)
+            self.data = []
+
+    def _commit_unit(self, state, district, mandi, records):
+        if self.ledger:
+            self.ledger.complete(state, district, mandi, records)
+        self.dedup.commit((state, district, mandi))
+
+    def _throttle(self):
+        if self.throttle:
+            self.throttle()
+
+    def _fail_unit(self, state, district, mandi, error):
+        self.failures.append((district, mandi))
+        self.dedup.discard((state, district, mandi))
+        if self.ledger:
+            self.ledger.fail(state, district, mandi, error)
 
     def process_mandis_in_district(self, state, district):
-        """Process individual mandis within a district"""
+        """Process individual mandis within a district; returns False if they could not be listed"""
         try:
             dropdowns = self.driver.find_elements(By.CSS_SELECTOR, "select")
 
@@ -187,23 +372,20 @@ class FocusedEnamScraper:
 
                 if mandi_options:
                     print(f"    Found {len(mandi_options)} mandis in {district}")
+                    mandis = [(opt.text.strip(), opt.get_attribute('value')) for opt in mandi_options]
+                    if self.ledger:
+                        self.ledger.add_units(state, district, [text for text, _ in mandis])
 
                     # CHANGED: Process ALL mandis instead of limiting to 3
-                    for i, mandi_option in enumerate(mandi_options):
-                        mandi_text = mandi_option.text.strip()
-                        mandi_value = mandi_option.get_attribute('value')
+                    for i, (mandi_text, mandi_value) in enumerate(mandis):
+                        if self.ledger and self.ledger.is_done(state, district, mandi_text):
+                            continue
 
                         print(f"      Processing mandi {i+1}/{len(mandi_options)}: {mandi_text}")
 
                         try:
-                            # Re-select everything
-                            dropdowns = self.driver.find_elements(By.CSS_SELECTOR, "select")
-                            Select(dropdowns[1]).select_by_visible_text(state)
-                            time.sleep(1)
-                            Select(dropdowns[2]).select_by_visible_text(district)
-                            time.sleep(2)
-                            Select(dropdowns[3]).select_by_value(mandi_value)
-                            time.sleep(3)
+                            # Only the mandi changes unless the page reset state/district
+                            self.navigator.goto(state, district, mandi_value)
 
                             # Extract data for this specific mandi
                             extracted_count = len(self.data)
@@ -214,281 +396,308 @@ class FocusedEnamScraper:
                                 print(f"        ✓ Extracted {new_extractions} records for {mandi_text}")
                             else:
                                 print(f"        ! No specific data found for {mandi_text}")
+                            self._commit_unit(state, district, mandi_text, self.data[extracted_count:])
+                            self._drain()
 
                         except Exception as e:
                             print(f"        ✗ Error processing mandi {mandi_text}: {e}")
+                            self.metrics.incr('errors', level='mandi')
+                            self._fail_unit(state, district, mandi_text, e)
+                            self.navigator.reset()  # Re-select everything for the next mandi
                             continue
 
+            return True
+
         except Exception as e:
             print(f"    Error processing mandis: {e}")
+            self._fail_unit(state, district, '', e)
+            return False
 
     def extract_all_visible_data(self, state, district, mandi=None):
-        """Extract all visible data from current page using multiple methods"""
+        """Extract all visible data from one page_source snapshot using multiple methods"""
+        try:
+            with self.metrics.span('page_source'):
+                html = self.driver.page_source
+            if self.archive:
+                self.archive.add(html, state, district, mandi)
+            with self.metrics.span('extract', method='parse'):
+                soup = extraction.parse_html(html)
+        except Exception as e:
+            print(f"      Error reading page source: {e}")
+            return
+
+        self._unit = (state, district, mandi or '')
+        self._page_records = []
+        if self.fingerprints:
+            digest = page_fingerprint(extraction.element_text(soup.body or soup))
+            previous = self.fingerprints.lookup(state, district, mandi, digest)
+            if previous is not None:
+                self.metrics.incr('pages_reused')
+                self.data.extend(record for record in previous if self._keep(record))
+                print(f"      ✓ Page unchanged, reused {len(previous)} records")
+                return
 
         # Method 1: Extract from tables
-        self.extract_from_tables(state, district, mandi)
+        self.extract_from_tables(state, district, mandi, soup)
 
         # Method 2: Extract from page text
-        self.extract_from_page_text(state, district, mandi)
+        self.extract_from_page_text(state, district, mandi, soup)
 
         # Method 3: Check for specific elements
-        self.extract_from_elements(state, district, mandi)
+        self.extract_from_elements(state, district, mandi, soup)
 
-    def extract_from_tables(self, state, district, mandi=None):
-        """Extract data from HTML tables"""
-        try:
-            tables = self.driver.find_elements(By.CSS_SELECTOR, "table")
+        if self.fingerprints:
+            # The whole page, not just what survived dedup against other units
+            self.fingerprints.update(state, district, mandi, digest, self._page_records)
 
-            for table in tables:
-                rows = table.find_elements(By.CSS_SELECTOR, "tr")
-                if len(rows) < 2:
-                    continue
+    def _keep(self, record):
+        if self.dedup.add(record, self._unit):
+            return True
+        self.metrics.incr('records_duplicate')
+        return False
+
+    def _store(self, record, method):
+        """Keep a record unless an equivalent one was already extracted"""
+        self._page_records.append(record)
+        if self._keep(record):
+            self.data.append(record)
+            self.metrics.incr('records_extracted', method=method.lower())
+            print(f"      ✓ {method} extraction: {record['mandi_name'] or 'Unknown'}")
 
-                # Check if this table contains contact details
-                table_text = table.text.lower()
-                if any(keyword in table_text for keyword in ['mandi', 'contact', 'address', 'apmc']):
-
-                    record = {
-                        'state': state,
-                        'district': district,
-                        'mandi_name': mandi or '',
-                        'address': '',
-                        'contact_details': ''
-                    }
-
-                    for row in rows:
-                        cells = row.find_elements(By.CSS_SELECTOR, "td, th")
-                        if len(cells) >= 2:
-                            key = cells[0].text.strip().lower()
-                            value = cells[1].text.strip()
-
-                            if 'mandi' in key and 'name' in key:
-                                record['mandi_name'] = value
-                            elif 'address' in key:
-                                record['address'] = value
-                            elif 'contact' in key:
-                                record['contact_details'] = value
-                            elif 'state' in key and not record['state']:
-                                record['state'] = value
-
-                    # Only add if we found meaningful data AND address is not empty
-                    if (record['mandi_name'] or record['contact_details']) and record['address'].strip():
-                        self.data.append(record)
-                        print(f"      ✓ Table extraction: {record['mandi_name'] or 'Unknown'}")
+    def _page_soup(self, soup):
+        return soup if soup is not None else extraction.parse_html(self.driver.page_source)
 
+    def extract_from_tables(self, state, district, mandi=None, soup=None):
+        """Extract data from HTML tables"""
+        try:
+            with self.metrics.span('extract', method='table'):
+                records = extraction.extract_from_tables(self._page_soup(soup), state, district, mandi)
+            for record in records:
+                self._store(record, "Table")
         except Exception as e:
             print(f"      Error in table extraction: {e}")
 
-    def extract_from_page_text(self, state, district, mandi=None):
+    def extract_from_page_text(self, state, district, mandi=None, soup=None):
         """Extract data from plain page text"""
         try:
-            body = self.driver.find_element(By.TAG_NAME, "body")
-            page_text = body.text
-
-            # Look for contact details patterns
-            if any(keyword in page_text.lower() for keyword in ['contact details', 'mandi name', 'apmc']):
-
-                # Try to find structured information
-                lines = page_text.split('\n')
-                record = None
-
-                for line in lines:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    # Look for key indicators
-                    if 'mandi name' in line.lower() and ':' in line:
-                        if not record:
-                            record = {
-                                'state': state,
-                                'district': district,
-                                'mandi_name': mandi or '',
-                                'address': '',
-                                'contact_details': ''
-                            }
-
-                        parts = line.split(':', 1)
-                        if len(parts) == 2:
-                            record['mandi_name'] = parts[1].strip()
-
-                    elif record and 'address' in line.lower() and ':' in line:
-                        parts = line.split(':', 1)
-                        if len(parts) == 2:
-                            record['address'] = parts[1].strip()
-
-                    elif record and 'contact' in line.lower() and ':' in line:
-                        parts = line.split(':', 1)
-                        if len(parts) == 2:
-                            record['contact_details'] = parts[1].strip()
-
-                if record and record['address'].strip() and (record['mandi_name'] or record['contact_details']):
-                    self.data.append(record)
-                    print(f"      ✓ Text extraction: {record['mandi_name'] or 'Unknown'}")
-
+            with self.metrics.span('extract', method='text'):
+                soup = self._page_soup(soup)
+                page_text = extraction.element_text(soup.body or soup)
+                records = extraction.extract_from_page_text(page_text, state, district, mandi)
+            for record in records:
+                self._store(record, "Text")
         except Exception as e:
             print(f"      Error in text extraction: {e}")
 
-    def extract_from_elements(self, state, district, mandi=None):
+    def extract_from_elements(self, state, district, mandi=None, soup=None):
         """Extract data from specific page elements"""
         try:
-            # Look for common result containers
-            selectors = [
-                '.result', '.contact-details', '.mandi-details',
-                '.table-responsive', '.search-result', '.data-row',
-                '[class*="result"]', '[class*="contact"]', '[class*="mandi"]'
-            ]
-
-            for selector in selectors:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-
-                for element in elements:
-                    element_text = element.text.strip()
-                    if len(element_text) > 20 and any(keyword in element_text.lower()
-                                                     for keyword in ['mandi', 'contact', 'apmc']):
-
-                        # Only extract if we can find address information
-                        if any(addr_keyword in element_text.lower() for addr_keyword in ['address', 'road', 'pin', 'market']):
-                            record = {
-                                'state': state,
-                                'district': district,
-                                'mandi_name': mandi or self.extract_mandi_name_from_text(element_text),
-                                'address': self.extract_address_from_text(element_text),
-                                'contact_details': self.extract_contact_from_text(element_text)
-                            }
-
-                            # Only add if address is found
-                            if record['address'].strip():
-                                self.data.append(record)
-                                print(f"      ✓ Element extraction: {record['mandi_name'] or 'Unknown'}")
-                                break  # Only take first valid match per selector
-
+            with self.metrics.span('extract', method='element'):
+                records = extraction.extract_from_elements(self._page_soup(soup), state, district, mandi)
+            for record in records:
+                self._store(record, "Element")
         except Exception as e:
             print(f"      Error in element extraction: {e}")
 
     def extract_mandi_name_from_text(self, text):
         """Extract mandi name from text"""
-        lines = text.split('\n')
-        for line in lines:
-            if 'mandi name' in line.lower() and ':' in line:
-                parts = line.split(':', 1)
-                if len(parts) == 2:
-                    return parts[1].strip()
-            elif 'apmc' in line.lower() and len(line) < 100:
-                return line.strip()
-        return ''
+        return extraction.extract_mandi_name_from_text(text)
 
     def extract_address_from_text(self, text):
         """Extract address from text"""
-        lines = text.split('\n')
-        for line in lines:
-            if 'address' in line.lower() and ':' in line:
-                parts = line.split(':', 1)
-                if len(parts) == 2:
-                    return parts[1].strip()
-            elif any(keyword in line.lower() for keyword in ['road', 'pin', 'market', 'commiti']) and len(line) > 20:
-                return line.strip()
-        return ''
+        return extraction.extract_address_from_text(text)
 
     def extract_contact_from_text(self, text):
         """Extract contact details from text"""
-        lines = text.split('\n')
-        contact_info = []
-
-        for line in lines:
-            line = line.strip()
-            if 'contact' in line.lower() and ':' in line:
-                parts = line.split(':', 1)
-                if len(parts) == 2:
-                    contact_info.append(parts[1].strip())
-            elif '@' in line or any(char.isdigit() for char in line):
-                # Look for email or phone patterns
-                if len(line) < 50 and (line.count('@') == 1 or any(char.isdigit() for char in line)):
-                    contact_info.append(line)
-
-        return ', '.join(contact_info)
+        return extraction.extract_contact_from_text(text)
 
     def save_results(self):
         """Save results to CSV with data cleaning"""
-        if self.data:
-            # Create DataFrame
-            df = pd.DataFrame(self.data)
-
-            # Clean and filter data
-            df = self.clean_data(df)
-
-            if len(df) > 0:
-                filename = f"enam_clean_data_{int(time.time())}.csv"
-                df.to_csv(filename, index=False)
-                print(f"\n🎉 SUCCESS: Saved {len(df)} clean records to {filename}")
-
-                # Show summary
-                print(f"\nData Summary:")
-                print(f"- Total records: {len(df)}")
-                print(f"- States: {df['state'].nunique()}")
-                print(f"- Districts: {df['district'].nunique()}")
-                print(f"- Records with addresses: {df['address'].notna().sum()}")
-                print(f"- Records with contact details: {df['contact_details'].notna().sum()}")
-
-                print(f"\nSample records:")
-                for i, row in df.head().iterrows():
-                    print(f"{i+1}. {row['mandi_name']} | {row['district']} | Address: {row['address'][:50]}...")
-
-                return df
-            else:
-                print("\n❌ No valid data after cleaning")
-                return None
-        else:
-            print("\n❌ No data extracted")
-            return None
+        return save_records(self.data, self.metrics)
 
     def clean_data(self, df):
         """Clean and filter the extracted data"""
-        print(f"Cleaning data: {len(df)} raw records")
-
-        # Remove records without address
-        df = df[df['address'].notna() & (df['address'].str.strip() != '')]
-        print(f"After address filter: {len(df)} records")
-
-        # Remove duplicate records (same mandi_name + address)
-        df = df.drop_duplicates(subset=['mandi_name', 'address'], keep='first')
-        print(f"After removing duplicates: {len(df)} records")
+        return clean_data(df)
+
+
+def save_records(data, metrics=None, output_path=None):
+    """Save raw records (or a DataFrame of them) to CSV with data cleaning
+
+    Written to `output_path` (.csv/.jsonl/.parquet) if given, else to a timestamped CSV.
+    """
+    # Create DataFrame, one column at a time
+    df = data if isinstance(data, pd.DataFrame) else records_frame(data or [])
+    if len(df):
+        # Clean and filter data
+        metrics = metrics or Metrics()
+        with metrics.span('clean'):
+            raw_count = len(df)
+            df = clean_data(df)
+            clean_count = len(df)
+            df = collapse_near_duplicates(df)
+            df = add_address_columns(add_contact_columns(df))
+        metrics.incr('records_rejected', raw_count - clean_count, reason='cleaning')
+        metrics.incr('records_rejected', clean_count - len(df), reason='near_duplicate')
+
+        if len(df) > 0:
+            filename = output_path or f"enam_clean_data_{int(time.time())}.csv"
+            write_output(df, filename)
+            print(f"\n🎉 SUCCESS: Saved {len(df)} clean records to {filename}")
+
+            # Show summary
+            print(f"\nData Summary:")
+            print(f"- Total records: {len(df)}")
+            print(f"- States: {df['state'].nunique()}")
+            print(f"- Districts: {df['district'].nunique()}")
+            print(f"- Records with addresses: {df['address'].notna().sum()}")
+            print(f"- Records with contact details: {df['contact_details'].notna().sum()}")
+            print(f"- PIN codes matching the state/district: {(df['pin_check'] == 'ok').sum()}")
+            print(f"- Records with a phone number: {((df['landline'] != '') | (df['mobile'] != '')).sum()}")
+
+            print(f"\nSample records:")
+            for i, row in df.head().iterrows():
+                print(f"{i+1}. {row['mandi_name']} | {row['district']} | Address: {row['address'][:50]}...")
+
+            return df
+        else:
+            print("\n❌ No valid data after cleaning")
+            return None
+    else:
+        print("\n❌ No data extracted")
+        return None
 
-        # Clean text fields
-        for col in ['mandi_name', 'address', 'contact_details']:
-            if col in df.columns:
-                df[col] = df[col].astype(str).str.strip()
-                df[col] = df[col].replace('nan', '')
+def open_ledger(state, ledger_path=None, resume=False):
+    """Open the work ledger for a run; a non-resumed run starts the state from scratch"""
+    if ledger_path is None and not resume:
+        return None
+    ledger = WorkLedger(ledger_path or DEFAULT_LEDGER)
+    if resume:
+        print(f"Resuming {state} from {ledger.path}: {ledger.summary(state) or 'no units yet'}")
+    else:
+        ledger.reset(state)
+    return ledger
 
-        # Remove records where mandi_name is empty or just generic text
-        invalid_mandi_names = ['', 'unknown', 'element_', 'debug_', 'nan', 'none']
-        df = df[~df['mandi_name'].str.lower().isin(invalid_mandi_names)]
-        df = df[~df['mandi_name'].str.lower().str.startswith('element_')]
-        df = df[~df['mandi_name'].str.lower().str.startswith('debug_')]
-        print(f"After mandi name filter: {len(df)} records")
 
-        # Ensure minimum data quality - must have either mandi_name or meaningful address
-        df = df[
-            (df['mandi_name'].str.len() > 3) |
-            (df['address'].str.len() > 20)
-        ]
-        print(f"After quality filter: {len(df)} records")
+def save_incremental(df, fingerprints_path, since):
+    """Write the delta for everything fingerprinted since `since`"""
+    store = FingerprintStore(fingerprints_path)
+    try:
+        write_delta(store, df, store.scope(since))
+    finally:
+        store.close()
+
+
+def _scrape(state, max_districts=None, workers=1, archive_dir=None, ledger_path=None,
+            resume=False, fingerprints_path=None, sink=None, base_url=ENAM_URL, metrics=None,
+            lean=False, scraper=None, concurrency=None, rate=None, retries=None):
+    """Scrape one state; returns the clean DataFrame, or None when records went to `sink`
+
+    An open `scraper` (keep_open=True) is reused instead of starting a new Chrome.
+    `state=None` scrapes every state in the dropdown as one job.
+    """
+    if state is None:
+        from enam_scraper.national import run_all_states
+        return run_all_states(max_districts, workers, archive_dir, ledger_path, resume, fingerprints_path,
+                              sink, base_url, metrics, lean)
+    if concurrency or rate:
+        from enam_scraper.orchestrator import DEFAULT_RATE, DEFAULT_RETRIES, run_async_scraper
+        return run_async_scraper(state, max_districts, concurrency or 1, rate or DEFAULT_RATE,
+                                 DEFAULT_RETRIES if retries is None else retries, archive_dir, ledger_path,
+                                 resume, fingerprints_path, sink, base_url, metrics, lean)
+    if workers > 1:
+        from enam_scraper.parallel import run_parallel_scraper
+        return run_parallel_scraper(state, max_districts, workers, archive_dir, ledger_path, resume,
+                                    fingerprints_path, sink, base_url, metrics, lean)
+
+    started = time.time()
+    ledger = open_ledger(state, ledger_path, resume)
+    if ledger and sink:
+        # Records committed by earlier, interrupted runs
+        sink.write_many(ledger.iter_records(state))
+    fingerprints = FingerprintStore(fingerprints_path) if fingerprints_path else None
+    if scraper is None:
+        scraper = FocusedEnamScraper(archive_dir=archive_dir, ledger=ledger, fingerprints=fingerprints,
+                                     sink=sink, base_url=base_url, metrics=metrics, lean=lean)
+    else:
+        print("✓ Reusing the open Chrome driver")
+        scraper.data = []
+        scraper.dedup = DedupIndex()
+        scraper.ledger, scraper.fingerprints, scraper.sink = ledger, fingerprints, sink
+        scraper.archive = SnapshotArchive(archive_dir) if archive_dir else None
+    scraper.scrape_step_by_step(state, max_districts)
+    if fingerprints:
+        print(f"\nReused {fingerprints.reused} unchanged pages")
+        fingerprints.close()
+    if sink:
+        return None
 
-        # Reset index
-        df = df.reset_index(drop=True)
+    if ledger:
+        # Includes records committed by earlier, interrupted runs
+        df = save_records(ledger.records(state), metrics)
+    else:
+        df = scraper.save_results()
+    if fingerprints:
+        save_incremental(df, fingerprints_path, started)
+    return df
 
-        return df
 
 # Modified usage function to scrape ALL districts and mandis
-def run_focused_scraper(state="Maharashtra", max_districts=None):
-    """Run the focused scraper for ALL districts and mandis"""
-    scraper = FocusedEnamScraper()
+def run_focused_scraper(state="Maharashtra", max_districts=None, workers=1, archive_dir=None,
+                        ledger_path=None, resume=False, fingerprints_path=None,
+                        output_path=None, stream=False, base_url=ENAM_URL, metrics=None,
+                        lean=False, scraper=None, concurrency=None, rate=None, retries=None, sink=None):
+    """Run the focused scraper for ALL districts and mandis
+
+    `state=None` covers all of India in one job: every state in the dropdown,
+    districts handed to the workers largest-first, one consolidated output.
+    By default returns the clean DataFrame. With `output_path` (.csv/.jsonl/.parquet)
+    clean records are streamed to that file while scraping and the path is returned;
+    an open `sink` shared by several runs is used the same way, but the caller
+    closes it (and writes the incremental delta once it is complete);
+    with `stream=True` a generator of clean records is returned. `base_url` points
+    the scraper at another copy of the contact page (e.g. the local stand-in portal).
+    Stage timings and counters go to `metrics` (a fresh Metrics by default) and
+    are printed as a table at the end. `lean` starts Chrome without images, fonts
+    and trackers; pass an open `scraper` (keep_open=True) to reuse its driver.
+    `concurrency` and/or `rate` switch to the asyncio scheduler: that many drivers
+    share a budget of `rate` portal requests/sec, and failed districts are retried
+    up to `retries` times with jittered backoff.
+    """
+    metrics = metrics or Metrics()
+    options = dict(max_districts=max_districts, workers=workers, archive_dir=archive_dir,
+                   ledger_path=ledger_path, resume=resume, fingerprints_path=fingerprints_path,
+                   base_url=base_url, metrics=metrics, lean=lean, scraper=scraper,
+                   concurrency=concurrency, rate=rate, retries=retries)
+    if stream:
+        return iter_clean_records(lambda sink: _scrape(state, sink=sink, **options))
+
     try:
-        data = scraper.scrape_step_by_step(state, max_districts)
-        return scraper.save_results()
+        if output_path is None and sink is None:
+            return _scrape(state, **options)
+
+        started = time.time()
+        shared = sink is not None
+        sink = sink or open_sink(output_path)
+        raw_before, written_before = sink.raw_count, sink.written
+        try:
+            _scrape(state, sink=sink, **options)
+        finally:
+            if shared:
+                sink.flush()
+            else:
+                sink.close()
+        written = sink.written - written_before
+        metrics.incr('records_rejected', sink.raw_count - raw_before - written, reason='cleaning')
+        if written == 0:
+            return None
+        if fingerprints_path and not shared:
+            save_incremental(read_output(output_path), fingerprints_path, started)
+        return sink.path
     except Exception as e:
         print(f"Scraper failed: {e}")
         return None
+    finally:
+        metrics.print_summary()
 
 # Run it for ALL districts and mandis in Gujarat
 if __name__ == "__main__":
@@ -0,0 +1,272 @@
+"""Streaming record sinks with bounded memory.
+
+Records are buffered in small chunks, cleaned with the `clean_data` rules per
+chunk, given the typed contact and PIN cross-check columns and appended to the output (CSV, JSONL
+or Parquet row groups; each run replaces the file on close), so memory stays flat no matter how many states are
+scraped. Duplicates across chunks are dropped through a set of normalized (mandi_name, address) key hashes.
+
+Near-duplicate address variants (`dedup.collapse_near_duplicates`) need the
+whole run and are only folded by the non-streamed path (`save_records`); run
+`python -m enam_scraper.cli clean` over a streamed output to fold them too.
+"""
+import os
+import queue
+import threading
+import time
+
+import pandas as pd
+
+from enam_scraper.addresses import ADDRESS_FIELDS, add_address_columns, normalize_address
+from enam_scraper.cleaning import clean_data
+from enam_scraper.contacts import CONTACT_FIELDS, add_contact_columns
+from enam_scraper.dedup import normalize_text
+from enam_scraper.records import FIELDS as RECORD_FIELDS, records_frame
+
+FIELDS = list(RECORD_FIELDS)
+OUTPUT_FIELDS = FIELDS + CONTACT_FIELDS + ADDRESS_FIELDS
+QUEUE_POLL = 0.2  # Seconds between checks for a consumer that stopped reading
+
+
+class RecordSink:
+    def __init__(self, chunk_size=500, flush_interval=30):
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.seen = set()
+        self.raw_count = 0
+        self.written = 0
+        self.last_flush = time.monotonic()
+
+    def write(self, record):
+        self.buffer.append(record)
+        self.raw_count += 1
+        if (len(self.buffer) >= self.chunk_size or
+                time.monotonic() - self.last_flush >= self.flush_interval):
+            self.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        """Clean the buffered chunk and hand it to the output"""
+        self.last_flush = time.monotonic()
+        if not self.buffer:
+            return
+        df = clean_data(records_frame(self.buffer), verbose=False)
+        self.buffer = []
+
+        # Drop records already written by an earlier chunk
+        keys = [hash((normalize_text(name), normalize_address(address)))
+                for name, address in zip(df['mandi_name'], df['address'])]
+        keep = []
+        for key in keys:
+            keep.append(key not in self.seen)
+            self.seen.add(key)
+        df = df[keep]
+
+        if len(df):
+            self._write_chunk(add_address_columns(add_contact_columns(df)))
+            self.written += len(df)
+
+    def close(self):
+        self.flush()
+        self._close()
+        print(f"✓ Streamed {self.written} clean records ({self.raw_count} raw)")
+
+    def _write_chunk(self, df):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FileSink(RecordSink):
+    """Writes to `path`.part and moves it over `path` on close
+
+    Every run replaces the output rather than appending to it, whatever the
+    format: a re-run or --resume writes the ledger's records again, and an
+    interrupted run leaves the previous output untouched.
+
+    >>> import tempfile
+    >>> from enam_scraper.records import MandiRecord
+    >>> records = [MandiRecord('Gujarat', 'Rajkot', f'APMC Mandi {i}', f'Market Yard {i}, Rajkot 360003')
+    ...            for i in range(3)]
+    >>> root = tempfile.mkdtemp()
+    >>> for ext in ('.csv', '.jsonl'):
+    ...     for run in range(2):
+    ...         with open_sink(os.path.join(root, 'out' + ext)) as sink:
+    ...             sink.write_many(records)
+    ...     print(ext, len(read_output(os.path.join(root, 'out' + ext))))
+    ✓ Streamed 3 clean records (3 raw)
+    ✓ Streamed 3 clean records (3 raw)
+    .csv 3
+    ✓ Streamed 3 clean records (3 raw)
+    ✓ Streamed 3 clean records (3 raw)
+    .jsonl 3
+    """
+
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.part = f"{path}.part"
+        open(self.part, 'w').close()
+
+    def _close(self):
+        os.replace(self.part, self.path)
+
+
+class CsvSink(FileSink):
+    def __init__(self, path, **kwargs):
+        super().__init__(path, **kwargs)
+        self.header = True
+
+    def _write_chunk(self, df):
+        df.to_csv(self.part, mode='a', header=self.header, index=False)
+        self.header = False
+
+
+class JsonlSink(FileSink):
+    def _write_chunk(self, df):
+        with open(self.part, 'a', encoding='utf-8') as f:
+            df.to_json(f, orient='records', lines=True, force_ascii=False)
+            f.write('\n')
+
+
+class ParquetSink(FileSink):
+    """Writes each flushed chunk as one Parquet row group (requires pyarrow)"""
+
+    def __init__(self, path, **kwargs):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("Parquet output requires pyarrow: pip install pyarrow") from e
+        super().__init__(path, **kwargs)
+        self.pa = pyarrow
+        self.schema = pyarrow.schema([(field, pyarrow.string()) for field in OUTPUT_FIELDS])
+        self.writer = pyarrow.parquet.ParquetWriter(self.part, self.schema)
+
+    def _write_chunk(self, df):
+        table = self.pa.Table.from_pandas(df[OUTPUT_FIELDS].astype(str), schema=self.schema,
+                                          preserve_index=False)
+        self.writer.write_table(table)
+
+    def _close(self):
+        self.writer.close()
+        super()._close()
+
+
+class StreamClosed(Exception):
+    """The consumer of a QueueSink stopped reading"""
+
+
+class QueueSink(RecordSink):
+    """Hands clean records to a consumer thread through a bounded queue"""
+
+    def __init__(self, maxsize=1000, **kwargs):
+        super().__init__(**kwargs)
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.closed = threading.Event()  # Set by the consumer when it stops reading
+
+    def write_many(self, records):
+        # Checked once per unit, so a run stops soon after its consumer is gone
+        if self.closed.is_set():
+            raise StreamClosed("the consumer stopped reading")
+        super().write_many(records)
+
+    def put(self, item):
+        """Queue an item, waiting while the consumer is behind; False once it has stopped reading"""
+        while not self.closed.is_set():
+            try:
+                self.queue.put(item, timeout=QUEUE_POLL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _write_chunk(self, df):
+        for record in df[OUTPUT_FIELDS].to_dict('records'):
+            if not self.put(record):
+                raise StreamClosed("the consumer stopped reading")
+
+
+SINKS = {'.csv': CsvSink, '.jsonl': JsonlSink, '.parquet': ParquetSink}
+
+
+def open_sink(path, **kwargs):
+    """Pick a sink from the output file extension"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in SINKS:
+        raise ValueError(f"Unsupported output format '{ext}' (use {', '.join(SINKS)})")
+    return SINKS[ext](path, **kwargs)
+
+
+def read_output(path):
+    """Load a sink's output file back into a DataFrame"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.parquet':
+        return pd.read_parquet(path)
+    if ext == '.jsonl':
+        return pd.read_json(path, lines=True, dtype=str)
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def write_output(df, path):
+    """Write a clean DataFrame in the format given by the file extension"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in SINKS:
+        raise ValueError(f"Unsupported output format '{ext}' (use {', '.join(SINKS)})")
+    if ext == '.parquet':
+        df.astype(str).to_parquet(path, index=False)
+    elif ext == '.jsonl':
+        df.to_json(path, orient='records', lines=True, force_ascii=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+_DONE = object()
+
+
+def iter_clean_records(run, **kwargs):
+    """Run `run(sink=...)` in a background thread and yield clean records as they stream in
+
+    Closing the generator early (break, `.close()`, garbage collection) makes
+    the sink raise StreamClosed at the run's next write, so the run stops and
+    its driver is closed; the generator returns once the thread has finished.
+    """
+    sink = QueueSink(**kwargs)
+    errors = []
+
+    def target():
+        try:
+            run(sink=sink)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            try:
+                sink.flush()
+            except StreamClosed:
+                pass
+            finally:
+                sink.put(_DONE)
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    try:
+        while True:
+            record = sink.queue.get()
+            if record is _DONE:
+                break
+            yield record
+    finally:
+        sink.closed.set()
+        thread.join()
+    if errors:
+        raise errors[0]
@@ -0,0 +1,147 @@
+"""Indexed local store of clean mandi records with full-text search.
+
+One SQLite file holds every mandi scraped so far, keyed on (state, district,
+normalized mandi name), so a repeat run updates its rows in place instead of
+adding another CSV. State, district and PIN code are indexed, and an FTS5
+table (kept in sync by triggers) searches mandi names and addresses:
+
+    store = MandiStore('enam_mandis.sqlite')
+    store.upsert(df)
+    store.search(district='Rajkot', pin='360')
+    store.search(text='krishi bazar', state='Maharashtra')
+
+Queries only need the standard library, so services can answer them in
+milliseconds without loading a CSV into pandas.
+"""
+import sqlite3
+import time
+
+DEFAULT_STORE = 'enam_mandis.sqlite'
+
+# sinks.OUTPUT_FIELDS less the derived address columns (not imported: that would pull in pandas)
+COLUMNS = ['state', 'district', 'mandi_name', 'address', 'contact_details',
+           'landline', 'mobile', 'email', 'pin_code', 'fax']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mandis (
+    id INTEGER PRIMARY KEY,
+    state TEXT NOT NULL COLLATE NOCASE,
+    district TEXT NOT NULL COLLATE NOCASE,
+    mandi_key TEXT NOT NULL,
+    mandi_name TEXT,
+    address TEXT,
+    contact_details TEXT,
+    landline TEXT,
+    mobile TEXT,
+    email TEXT,
+    pin_code TEXT,
+    fax TEXT,
+    first_seen REAL,
+    updated_at REAL,
+    UNIQUE (state, district, mandi_key)
+);
+CREATE INDEX IF NOT EXISTS mandis_district ON mandis (district);
+CREATE INDEX IF NOT EXISTS mandis_pin ON mandis (pin_code);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS mandis_fts USING fts5(
+    mandi_name, address, content='mandis', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS mandis_ai AFTER INSERT ON mandis BEGIN
+    INSERT INTO mandis_fts (rowid, mandi_name, address) VALUES (new.id, new.mandi_name, new.address);
+END;
+CREATE TRIGGER IF NOT EXISTS mandis_ad AFTER DELETE ON mandis BEGIN
+    INSERT INTO mandis_fts (mandis_fts, rowid, mandi_name, address)
+    VALUES ('delete', old.id, old.mandi_name, old.address);
+END;
+CREATE TRIGGER IF NOT EXISTS mandis_au AFTER UPDATE OF mandi_name, address ON mandis BEGIN
+    INSERT INTO mandis_fts (mandis_fts, rowid, mandi_name, address)
+    VALUES ('delete', old.id, old.mandi_name, old.address);
+    INSERT INTO mandis_fts (rowid, mandi_name, address) VALUES (new.id, new.mandi_name, new.address);
+END;
+"""
+
+UPSERT = f"""
+INSERT INTO mandis (mandi_key, {', '.join(COLUMNS)}, first_seen, updated_at)
+VALUES ({', '.join('?' * (len(COLUMNS) + 3))})
+ON CONFLICT (state, district, mandi_key) DO UPDATE SET
+    {', '.join(f'{column} = excluded.{column}' for column in COLUMNS[2:])},
+    updated_at = excluded.updated_at
+WHERE {' OR '.join(f'{column} IS NOT excluded.{column}' for column in COLUMNS[2:])}
+"""
+
+
+def fts_query(text):
+    """Every word of `text` as a quoted prefix term (all must match)"""
+    words = text.replace('"', ' ').split()
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def _prefix_range(prefix):
+    """[low, high) bounds matching every string that starts with `prefix`"""
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class MandiStore:
+    def __init__(self, path=DEFAULT_STORE):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def upsert(self, df):
+        """Insert new mandis and update changed ones from a clean DataFrame; returns rows added"""
+        from enam_scraper.dedup import normalize_text  # Only loading needs it (and pandas)
+
+        df = df.reindex(columns=COLUMNS).astype(object).fillna('').astype(str)  # Categoricals reject ''
+        now = time.time()
+        rows = [(normalize_text(row[2]),) + row + (now, now)
+                for row in df.itertuples(index=False, name=None)]
+        before = len(self)
+        with self.conn:
+            self.conn.executemany(UPSERT, rows)
+        added = len(self) - before
+        print(f"✓ Indexed {len(rows)} records in {self.path}: {added} new mandis, {len(self)} in total")
+        return added
+
+    def search(self, state=None, district=None, pin=None, text=None, limit=50):
+        """Mandis matching every given filter, best text matches first"""
+        conditions, params = [], []
+        query = f"SELECT {', '.join('m.' + column for column in COLUMNS)}, m.updated_at FROM mandis m"
+        if text:
+            query += " JOIN mandis_fts ON mandis_fts.rowid = m.id"
+            conditions.append("mandis_fts MATCH ?")
+            params.append(fts_query(text))
+        if state:
+            conditions.append("m.state = ?")
+            params.append(state)
+        if district:
+            conditions.append("m.district = ?")
+            params.append(district)
+        if pin:
+            # A range instead of LIKE so the PIN index is used
+            conditions.append("m.pin_code >= ? AND m.pin_code < ?")
+            params.extend(_prefix_range(pin))
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY " + ("bm25(mandis_fts)" if text else "m.state, m.district, m.mandi_name")
+        query += " LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self.conn.execute(query, params)]
+
+    def summary(self):
+        """Mandis per state"""
+        rows = self.conn.execute("SELECT state, COUNT(*) FROM mandis GROUP BY state ORDER BY state")
+        return {state: count for state, count in rows}
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM mandis").fetchone()[0]
@@ -0,0 +1,236 @@
+"""Condition-based waits for the eNAM APMC contact page.
+
+The portal repopulates its dependent dropdowns and result area through XHR
+calls, so instead of sleeping for a fixed time after every selection we wait
+until the page has actually settled: no requests in flight or waiting to be
+rendered, and either the dropdowns/results changed or the page stayed quiet
+for a short window.
+"""
+import time
+from contextlib import nullcontext
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Upper bound (seconds) for each navigation step before we give up waiting
+DEFAULT_TIMEOUTS = {
+    'page_load': 30,
+    'language': 10,
+    'state': 15,
+    'district': 15,
+    'mandi': 15,
+}
+
+# Fixed sleeps used only when the page state cannot be observed (JS errors,
+# CSP blocking our hook, ...). These are the delays the scraper used to apply
+# unconditionally.
+FALLBACK_SLEEPS = {
+    'page_load': 5,
+    'language': 3,
+    'state': 4,
+    'district': 4,
+    'mandi': 3,
+}
+
+# How long an idle page must stay unchanged before we accept that a selection
+# triggered no update (e.g. re-selecting the value that is already selected)
+QUIET_WINDOW = 0.5
+POLL_INTERVAL = 0.1
+
+# Counts XHR/fetch calls in flight so we can tell when the cascade has settled.
+# A fetch settles before the caller has parsed and rendered the response, so
+# the time of the last settled request is kept too, and a MutationObserver
+# notes whether the DOM has changed since then.
+AJAX_HOOK_JS = """
+if (!window.__enamWaitHook) {
+    window.__enamWaitHook = true;
+    window.__enamPending = 0;
+    window.__enamSettledAt = 0;
+    window.__enamRendered = true;
+    var done = function () {
+        window.__enamPending = Math.max(0, window.__enamPending - 1);
+        window.__enamSettledAt = performance.now();
+        window.__enamRendered = false;
+    };
+    var origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        window.__enamPending += 1;
+        this.addEventListener('loadend', done);
+        return origSend.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var origFetch = window.fetch;
+        window.fetch = function () {
+            window.__enamPending += 1;
+            return origFetch.apply(this, arguments).finally(done);
+        };
+    }
+    new MutationObserver(function () { window.__enamRendered = true; }).observe(
+        document.documentElement, {childList: true, subtree: true, characterData: true});
+}
+"""
+
+# Position of each step's dropdown on the page (language, state, district, mandi)
+SELECT_INDEX = {'language': 0, 'state': 1, 'district': 2, 'mandi': 3}
+
+# One round trip returning everything we compare between polls; the results
+# are signed with a hash of the tables' text. The hook is re-installed here so
+# it survives full page reloads.
+SNAPSHOT_JS = AJAX_HOOK_JS + """
+var pending = window.__enamPending || 0;
+if (window.jQuery && window.jQuery.active) { pending += window.jQuery.active; }
+var parts = [];
+var selects = document.querySelectorAll('select');
+for (var i = 0; i < selects.length; i++) {
+    var s = selects[i];
+    var n = s.options.length;
+    parts.push(s.value + '|' + n + '|' + (n ? s.options[n - 1].text : ''));
+}
+var tables = document.querySelectorAll('table');
+var hash = 0;
+for (var j = 0; j < tables.length; j++) {
+    var text = tables[j].textContent;
+    for (var k = 0; k < text.length; k++) { hash = (Math.imul(hash, 31) + text.charCodeAt(k)) | 0; }
+}
+return {
+    ready: document.readyState,
+    pending: pending,
+    rendered: window.__enamRendered,
+    since_settled: (performance.now() - window.__enamSettledAt) / 1000,
+    selects: selects.length,
+    select_parts: parts,
+    results: 'tables:' + tables.length + ':' + (hash >>> 0).toString(16)
+};
+"""
+
+
+def signature(snap, index):
+    """What a selection at dropdown `index` should change: the dropdowns after it and the results
+
+    The changed dropdown itself is left out, its new value alone says nothing
+    about whether the dependent ones have been repopulated yet.
+    """
+    return tuple(snap['select_parts'][index + 1:]) + (snap['results'],)
+
+
+def busy(snap):
+    """Requests in flight, or one just answered whose response the page hasn't rendered yet"""
+    if snap['pending'] > 0:
+        return True
+    return not snap['rendered'] and snap['since_settled'] < QUIET_WINDOW
+
+
+class WaitEngine:
+    def __init__(self, driver, timeouts=None, fallback_sleeps=None, metrics=None):
+        self.driver = driver
+        self.metrics = metrics
+        self.timeouts = dict(DEFAULT_TIMEOUTS, **(timeouts or {}))
+        self.fallback_sleeps = dict(FALLBACK_SLEEPS, **(fallback_sleeps or {}))
+        self.timings = []  # (step, seconds, outcome)
+
+    def snapshot(self):
+        """Return the current page state, or None if it cannot be read"""
+        try:
+            return self.driver.execute_script(SNAPSHOT_JS)
+        except WebDriverException:
+            return None
+
+    def wait_for_page_ready(self):
+        """Wait for the initial page load: document complete, dropdowns present, no XHR"""
+        start = time.monotonic()
+
+        def ready(_driver):
+            snap = self._read()
+            return snap['ready'] == 'complete' and snap['selects'] > 0
+
+        outcome = self._wait('page_load', ready, start=start, record=False)
+        if outcome == 'ok':
+            # The language/state dropdowns may still be filling in
+            outcome = self._wait('page_load', lambda _d: self._is_idle(), start=start, record=False)
+        self._record('page_load', time.monotonic() - start, outcome)
+        return outcome != 'timeout'
+
+    def wait_after_select(self, step, before, index=None):
+        """Wait until a selection (of dropdown `index`) made after taking `before` has settled"""
+        start = time.monotonic()
+        if before is None:
+            return self._fallback(step, start)
+        index = SELECT_INDEX[step] if index is None else index
+        previous = signature(before, index)
+
+        def settled(_driver):
+            snap = self._read()
+            if busy(snap):
+                return False
+            if signature(snap, index) != previous:
+                return True
+            return time.monotonic() - start >= QUIET_WINDOW
+
+        return self._wait(step, settled, start=start) != 'timeout'
+
+    def summary(self):
+        """Aggregate wait timings per step"""
+        stats = {}
+        for step, seconds, outcome in self.timings:
+            entry = stats.setdefault(step, {'count': 0, 'total': 0.0, 'max': 0.0,
+                                            'timeouts': 0, 'fallbacks': 0})
+            entry['count'] += 1
+            entry['total'] += seconds
+            entry['max'] = max(entry['max'], seconds)
+            if outcome == 'timeout':
+                entry['timeouts'] += 1
+            elif outcome == 'fallback':
+                entry['fallbacks'] += 1
+        for entry in stats.values():
+            entry['mean'] = entry['total'] / entry['count']
+        return stats
+
+    def print_summary(self):
+        """Print how long the waits actually took"""
+        stats = self.summary()
+        if not stats:
+            return
+        print("\nWait timings:")
+        for step, entry in stats.items():
+            print(f"- {step}: {entry['count']} waits, mean {entry['mean']:.2f}s, "
+                  f"max {entry['max']:.2f}s, total {entry['total']:.1f}s "
+                  f"({entry['timeouts']} timeouts, {entry['fallbacks']} fallbacks)")
+
+    def _read(self):
+        """Current page state; raises (so the wait falls back to sleeping) if it cannot be read"""
+        snap = self.snapshot()
+        if snap is None:
+            raise WebDriverException("page state unavailable")
+        return snap
+
+    def _is_idle(self):
+        return not busy(self._read())
+
+    def _wait(self, step, condition, start=None, record=True):
+        start = time.monotonic() if start is None else start
+        try:
+            with self.metrics.waiting() if self.metrics else nullcontext():
+                WebDriverWait(self.driver, self.timeouts[step], poll_frequency=POLL_INTERVAL,
+                              ignored_exceptions=()).until(condition)
+            outcome = 'ok'
+        except TimeoutException:
+            print(f"  ! Timed out after {self.timeouts[step]}s waiting for {step}")
+            outcome = 'timeout'
+        except WebDriverException:
+            # Page state unreadable - fall back to the old fixed delay
+            self._fallback(step, start, record=record)
+            return 'fallback'
+        if record:
+            self._record(step, time.monotonic() - start, outcome)
+        return outcome
+
+    def _fallback(self, step, start, record=True):
+        time.sleep(self.fallback_sleeps[step])
+        if record:
+            self._record(step, time.monotonic() - start, 'fallback')
+        return True
+
+    def _record(self, step, seconds, outcome):
+        self.timings.append((step, seconds, outcome))
+        if self.metrics:
+            self.metrics.observe('wait', seconds, step=step, outcome=outcome)